@@ -13,15 +13,43 @@ Funzionalità principali:
 
 Utilizzo:
     python crop.py input.jpg [--side left|right] output.jpg [--debug]
+    python crop.py cartella_input/ [--side left|right] cartella_output/ [--workers N]
+    python crop.py --server    (compiti da stdin: "input<TAB>output<TAB>side", una riga per immagine)
 """
 
-import cv2, numpy as np, argparse, os
-from scipy.optimize import curve_fit
+import cv2, numpy as np, argparse, os, sys
+from contextlib import redirect_stdout
+from concurrent.futures import ProcessPoolExecutor
+
+# Estensioni elaborate in modalità cartella
+IMAGE_EXTENSIONS = {'.jpg', '.jpeg', '.png', '.tif', '.tiff', '.bmp'}
+
+# Ricerca della piega a due livelli: per ROI larghe almeno FOLD_COARSE_MIN_WIDTH
+# px la piega viene stimata su una copia ridotta di FOLD_COARSE_FACTOR e
+# rifinita a piena risoluzione in una banda di ±FOLD_BAND_HALF_WIDTH px
+FOLD_COARSE_MIN_WIDTH = 512
+FOLD_COARSE_FACTOR = 4
+FOLD_BAND_HALF_WIDTH = 32
+
+# Immagini e grafici di debug: JPEG a qualità ridotta senza passata di
+# ottimizzazione né progressivo, grafici a 72 dpi (servono solo a vista)
+JPEG_DEBUG_PARAMS = [cv2.IMWRITE_JPEG_QUALITY, 60, cv2.IMWRITE_JPEG_OPTIMIZE, 0, cv2.IMWRITE_JPEG_PROGRESSIVE, 0]
+DEBUG_PLOT_DPI = 72
 
 # =======================
 # FUNZIONI DI UTILITY
 # =======================
 
+# Buffer di lavoro riutilizzati tra pagine consecutive della stessa dimensione
+_buffers = {}
+
+def _buffer(name, shape, dtype=np.uint8):
+    """Ritorna il buffer `name`, riallocandolo solo se forma o tipo cambiano."""
+    buf = _buffers.get(name)
+    if buf is None or buf.shape != shape or buf.dtype != dtype:
+        buf = _buffers[name] = np.empty(shape, dtype)
+    return buf
+
 def save_jpg(img, out_path, quality=90):
     """Salva un'immagine in formato JPG con qualità specificata."""
     cv2.imwrite(out_path, img, [cv2.IMWRITE_JPEG_QUALITY, quality])
@@ -39,13 +67,13 @@ def auto_detect_side(img):
     Rileva automaticamente il lato della piega (sinistra o destra)
     in base alla luminosità dei bordi dell'immagine.
     """
-    gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
-    h, w = gray.shape
+    h, w = img.shape[:2]
     margin = 10
     strip_width = 5
 
-    left_strip = gray[:, margin:margin + strip_width]
-    right_strip = gray[:, w - margin - strip_width:w - margin]
+    # Converte in grigio solo le due strisce lette, non l'immagine intera
+    left_strip = cv2.cvtColor(img[:, margin:margin + strip_width], cv2.COLOR_BGR2GRAY)
+    right_strip = cv2.cvtColor(img[:, w - margin - strip_width:w - margin], cv2.COLOR_BGR2GRAY)
 
     left_brightness = np.mean(left_strip)
     right_brightness = np.mean(right_strip)
@@ -54,6 +82,32 @@ def auto_detect_side(img):
         return None
     return 'right' if left_brightness < right_brightness else 'left'
 
+# Kernel gaussiano 1D (11 tap, sigma da OpenCV), calcolato una sola volta
+_GAUSS_11 = cv2.getGaussianKernel(11, 0).ravel()
+
+def smooth_profile(profile):
+    """
+    Sfoca un profilo 1D con il kernel gaussiano a 11 tap.
+    Equivale a cv2.GaussianBlur con bordo BORDER_REFLECT_101, ma senza il
+    passaggio per una Mat 2D.
+    """
+    padded = np.pad(profile, len(_GAUSS_11) // 2, mode='reflect')
+    return np.convolve(padded, _GAUSS_11, mode='valid')
+
+def refine_min_vertex(profile, i):
+    """
+    Posizione sub-pixel del minimo in i: vertice della parabola per i tre
+    campioni i-1, i, i+1 (forma chiusa, nessun fit).
+    Ritorna: i stesso ai bordi del profilo o se i tre punti sono allineati.
+    """
+    if i <= 0 or i >= len(profile) - 1:
+        return float(i)
+    ym1, y0, yp1 = float(profile[i - 1]), float(profile[i]), float(profile[i + 1])
+    denom = ym1 - 2 * y0 + yp1
+    if denom <= 0:
+        return float(i)
+    return i + 0.5 * (ym1 - yp1) / denom
+
 def parabola(x, a, b, c):
     """Funzione parabolica per fit."""
     return a*x**2 + b*x + c
@@ -66,7 +120,7 @@ def estimate_angle(gray, x_center, step=3):
     h = gray.shape[0]
     col_strip = gray[:, max(0, x_center - 2):min(gray.shape[1], x_center + 3)]
     mean_profile = col_strip.mean(axis=1)
-    smoothed = cv2.GaussianBlur(mean_profile, (1, 11), 0)
+    smoothed = smooth_profile(mean_profile)
     y = np.arange(len(smoothed))
 
     try:
@@ -83,58 +137,95 @@ def estimate_angle(gray, x_center, step=3):
     x_end = min(gray.shape[1], x_center + width // 2 + 1)
     roi_strip = gray[:, x_start:x_end]
 
-    xs, ys = [], []
-    for y in range(0, h, step):
-        col = roi_strip[y, :]
-        x_local = np.argmin(col)
-        xs.append(x_start + x_local)
-        ys.append(y)
+    # Minimo di ogni riga campionata, in un'unica passata vettoriale
+    ys = np.arange(0, h, step)
+    xs = x_start + roi_strip[::step].argmin(axis=1)
 
     a, b = np.polyfit(ys, xs, 1)
     angle = np.degrees(np.arctan(a))
     return angle, a, b, width
 
-def detect_fold_hough(img, side, debug=False, debug_dir=None):
+def sample_profiles(roi):
+    """
+    Profili di luminosità di 40 righe campione della ROI (in un'unica matrice),
+    scartando quelle con luminosità media anomala (oltre 1.5 std), o nessuna
+    se lo sarebbero tutte.
+    Ritorna: (righe tenute, profilo medio, profilo std)
+    """
+    rows = np.linspace(0, roi.shape[0]-1, num=40, dtype=int)
+    strips = roi[rows, :]
+    avg_ints = strips.mean(axis=1)
+    keep = np.abs(avg_ints - avg_ints.mean()) <= 1.5 * avg_ints.std()
+    filtered = strips[keep] if keep.any() else strips
+
+    # float32 basta per dati a 8 bit e dimezza i temporanei di std()
+    mean_profile = filtered.mean(axis=0, dtype=np.float32)
+    std_profile  = filtered.std(axis=0, dtype=np.float32)
+    return filtered, mean_profile, std_profile
+
+def detect_fold_hough(img, side, debug=False, debug_dir=None, use_opencl=False):
     """
     Rileva la posizione della piega tramite analisi dei profili di luminosità e fit parabolico.
     Opzionalmente salva immagini di debug.
+    Con use_opencl (e OpenCL disponibile) conversione in grigio e sfocatura
+    della fascia della ROI girano sulla GPU tramite la Transparent API di OpenCV.
     Ritorna: (x_final, angolo, coeff. angolare, intercetta)
     """
-    gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
-    blur = cv2.GaussianBlur(gray, (5,5), 0)
-
-    h, w = blur.shape
+    h, w = img.shape[:2]
     if side=='right':
         x0, x1 = int(0.8*w), w
     else:
         x0, x1 = 0, int(0.2*w)
-    roi = blur[:, x0:x1]
 
-    rows = np.linspace(0, h-1, num=40, dtype=int)
+    # Scansioni grandi: stima grossolana della piega su una copia ridotta
+    # della ROI, poi l'analisi a piena risoluzione si limita a una banda
+    # di ±FOLD_BAND_HALF_WIDTH px attorno alla stima
+    if x1 - x0 >= FOLD_COARSE_MIN_WIDTH:
+        f = FOLD_COARSE_FACTOR
+        small = cv2.resize(img[:, x0:x1], None, fx=1 / f, fy=1 / f, interpolation=cv2.INTER_AREA)
+        small = cv2.GaussianBlur(cv2.cvtColor(small, cv2.COLOR_BGR2GRAY), (5,5), 0)
+        _, coarse_mean, coarse_std = sample_profiles(small)
+        guess = x0 + int((np.argmin(coarse_mean + coarse_std) + 0.5) * f)
+        x0, x1 = max(x0, guess - FOLD_BAND_HALF_WIDTH), min(x1, guess + FOLD_BAND_HALF_WIDTH)
+
+    # Converte in grigio e sfoca solo la fascia della ROI (+2 px di contesto
+    # per il kernel 5x5): stesso risultato dell'elaborazione sull'immagine
+    # intera, sui soli pixel letti
+    p0, p1 = max(0, x0 - 2), min(w, x1 + 2)
+    if use_opencl and cv2.ocl.haveOpenCL():
+        gray_u = cv2.cvtColor(cv2.UMat(img[:, p0:p1]), cv2.COLOR_BGR2GRAY)
+        # Sulla CPU torna solo la fascia sfocata
+        roi = cv2.GaussianBlur(gray_u, (5,5), 0).get()[:, x0 - p0:x1 - p0]
+    else:
+        # Le scansioni di un lotto hanno in genere la stessa dimensione: i due
+        # buffer della fascia vengono riusati invece di riallocarli a ogni pagina
+        gray_strip = cv2.cvtColor(img[:, p0:p1], cv2.COLOR_BGR2GRAY,
+                                  dst=_buffer('gray_strip', (h, p1 - p0)))
+        blurred = cv2.GaussianBlur(gray_strip, (5,5), 0,
+                                   dst=_buffer('blurred_strip', (h, p1 - p0)))
+        roi = blurred[:, x0 - p0:x1 - p0]
+
     x_axis = np.arange(x0, x1)
-    tmp = [(r, roi[r, :], roi[r, :].mean()) for r in rows]
-    avg_ints = np.array([t[2] for t in tmp])
-    mean_int = avg_ints.mean()
-    std_int  = avg_ints.std()
-    filtered = [prof for (_, prof, avg) in tmp if abs(avg - mean_int) <= 1.5 * std_int]
-    if not filtered:
-        filtered = [prof for (_, prof, _) in tmp]
-
-    arr = np.array(filtered)
-    mean_profile = arr.mean(axis=0)
-    std_profile  = arr.std(axis=0)
-    smooth = cv2.GaussianBlur(mean_profile + std_profile, (11, 1), 0).flatten()
-    x_min = np.argmin(smooth)
-    x_fit = np.arange(max(0, x_min-15), min(len(smooth), x_min+16))
-    y_fit = smooth[x_fit]
-    popt, _ = curve_fit(parabola, x_fit, y_fit)
-    x_refined = -popt[1] / (2 * popt[0])
+    filtered, mean_profile, std_profile = sample_profiles(roi)
+    # Il profilo 1D arriva a OpenCV come colonna, quindi il vecchio
+    # GaussianBlur (11, 1) sfocava lungo una dimensione di larghezza 1 ed era
+    # l'identità: si usa direttamente la somma, senza la chiamata superflua
+    smooth = mean_profile + std_profile
+    x_min = int(np.argmin(smooth))
+    x_refined = refine_min_vertex(smooth, x_min)
     x_final = int(round(x0 + x_refined))
 
-    angle, a, b, width = estimate_angle(gray, x_final, step=3)
+    # estimate_angle legge al più ±26 px attorno alla piega: basta il grigio
+    # di quella striscia (l'intercetta torna poi in coordinate immagine)
+    s0, s1 = max(0, x_final - 27), min(w, x_final + 28)
+    gray_fold = cv2.cvtColor(img[:, s0:s1], cv2.COLOR_BGR2GRAY)
+    angle, a, b, width = estimate_angle(gray_fold, x_final - s0, step=3)
+    b += s0
 
     if debug and debug_dir:
-        import matplotlib.pyplot as plt  # Import solo se serve
+        import matplotlib  # Import solo se serve
+        matplotlib.use('Agg')  # Solo file, nessun backend GUI da sondare
+        import matplotlib.pyplot as plt
         os.makedirs(debug_dir, exist_ok=True)
 
         # Plot profili di luminosità e fit parabolico
@@ -151,9 +242,13 @@ def detect_fold_hough(img, side, debug=False, debug_dir=None):
         ax2.set_title('ROI preview')
         ax2.axis('off')
         plt.tight_layout()
-        plt.savefig(os.path.join(debug_dir, 'step_profiles.png'))
+        plt.savefig(os.path.join(debug_dir, 'step_profiles.png'), dpi=DEBUG_PLOT_DPI)
         plt.close(fig)
 
+        # Parabola su ±15 campioni, solo per il grafico
+        x_fit = np.arange(max(0, x_min-15), min(len(smooth), x_min+16))
+        popt = np.polyfit(x_fit, smooth[x_fit], 2)
+
         fig, ax = plt.subplots(figsize=(8, 4))
         ax.plot(x_axis, mean_profile, label='Mean profile', alpha=0.5)
         ax.plot(x_axis, smooth, label='Smoothed', color='orange')
@@ -164,70 +259,170 @@ def detect_fold_hough(img, side, debug=False, debug_dir=None):
         ax.legend()
         ax.grid(True)
         plt.tight_layout()
-        plt.savefig(os.path.join(debug_dir, 'step_min_fit.png'))
+        plt.savefig(os.path.join(debug_dir, 'step_min_fit.png'), dpi=DEBUG_PLOT_DPI)
         plt.close(fig)
 
     return x_final, angle, a, b
 
 # =======================
-# MAIN SCRIPT
+# ELABORAZIONE
 # =======================
 
-def main():
+def process_one(input_path, out_path=None, side=None, debug=False, use_opencl=False):
     """
-    Parsing degli argomenti, caricamento immagine, rilevamento piega, crop, rotazione e salvataggio.
+    Rilevamento piega, crop, rotazione e salvataggio di una singola immagine.
+    Ritorna: messaggio di stato.
     """
-    p = argparse.ArgumentParser()
-    p.add_argument("input")
-    p.add_argument("--side", choices=('left','right'), default=None)
-    p.add_argument("out", nargs='?')
-    p.add_argument("--debug", action='store_true')
-    args = p.parse_args()
+    img = cv2.imread(input_path)
+    if img is None:
+        raise ValueError(f"Image not found: {input_path}")
 
-    img = cv2.imread(args.input)
     width = min(1920, img.shape[1])
     quality = 90  # for jpg
 
-    if img is None:
-        raise ValueError(f"Image not found: {args.input}")
-
     debug_dir = None
-    if args.debug and args.out:
-        base, _ = os.path.splitext(args.out)
+    if debug and out_path:
+        base, _ = os.path.splitext(out_path)
         debug_dir = base + "_debug"
 
-    side = auto_detect_side(img) if args.side is None else args.side
+    if side is None:
+        side = auto_detect_side(img)
 
     if side not in ('left', 'right'):
         print("Attenzione: Lato della piega non rilevato, salvo originale")
         hd_img = resize_width_hd(img, target_width=width)
-        save_jpg(hd_img, args.out, quality=quality)
-        return
+        save_jpg(hd_img, out_path, quality=quality)
+        return f"Saved original: {input_path}"
 
-    x, angle, a, b = detect_fold_hough(img, side, debug=args.debug, debug_dir=debug_dir)
+    x, angle, a, b = detect_fold_hough(
+        img, side, debug=debug, debug_dir=debug_dir, use_opencl=use_opencl
+    )
     print(f"x: {x}, inclinazione stimata: {angle:.2f}°")
 
     h = img.shape[0]
-    if args.out:
+    if out_path:
         if debug_dir:
             vis = img.copy()
             x0_line = int(a * 0 + b)
             x1_line = int(a * h + b)
             cv2.line(vis, (x0_line, 0), (x1_line, h), (0, 0, 255), 2)
-            cv2.imwrite(args.out, vis)
+            cv2.imwrite(os.path.join(debug_dir, 'fold_line.jpg'), vis, JPEG_DEBUG_PARAMS)
 
-        # Crop e rotazione (porta la piega al bordo destro)
+        # Crop e rotazione (porta la piega al bordo destro) in un solo
+        # warpAffine: si calcolano solo le colonne tenute, traslando la
+        # rotazione sull'origine del crop (stessi pixel di ruotare tutto e
+        # poi tagliare, senza il buffer ruotato a piena pagina)
         M = cv2.getRotationMatrix2D(center=(x, h//2), angle=-angle, scale=1.0)
-        rotated = cv2.warpAffine(img, M, (img.shape[1], img.shape[0]), flags=cv2.INTER_LINEAR, borderMode=cv2.BORDER_REPLICATE)
-
-        if side == 'right':
-            cropped = rotated[:, :x]
-        else:
-            cropped = rotated[:, x:]
+        keep = slice(None, x) if side == 'right' else slice(x, None)
+        c0, c1, _ = keep.indices(img.shape[1])
+        M[0, 2] -= c0
+        cropped = cv2.warpAffine(img, M, (max(0, c1 - c0), h), flags=cv2.INTER_LINEAR, borderMode=cv2.BORDER_REPLICATE)
 
         # Ridimensiona e salva il risultato finale
         cropped_hd = resize_width_hd(cropped, target_width=width)
-        save_jpg(cropped_hd, args.out, quality=quality)
+        save_jpg(cropped_hd, out_path, quality=quality)
+
+    return f"Processed: {input_path}"
+
+def _init_worker():
+    """
+    Inizializzazione dei processi worker: un solo thread OpenCV per processo,
+    il parallelismo è già dato dal numero di processi.
+    """
+    cv2.setNumThreads(1)
+
+def _process_job(job):
+    """Esegue process_one su (input, output, side, debug, use_opencl) senza propagare errori."""
+    input_path = job[0]
+    try:
+        return process_one(*job)
+    except Exception as e:
+        return f"[ERROR] {input_path}: {e}"
+
+def process_folder(input_dir, out_dir, side=None, debug=False, workers=None, use_opencl=False):
+    """
+    Elabora in parallelo tutte le immagini di una cartella, su un pool di processi
+    (un avvio di Python e di OpenCV per worker invece che per immagine).
+    Ritorna: numero di immagini fallite.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    names = sorted(
+        n for n in os.listdir(input_dir)
+        if os.path.splitext(n)[1].lower() in IMAGE_EXTENSIONS
+    )
+    jobs = [
+        (os.path.join(input_dir, n), os.path.join(out_dir, os.path.splitext(n)[0] + ".jpg"), side, debug, use_opencl)
+        for n in names
+    ]
+
+    errors = 0
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as executor:
+        for status in executor.map(_process_job, jobs, chunksize=8):
+            print(status)
+            errors += status.startswith("[ERROR]")
+    return errors
+
+def serve(debug=False, use_opencl=False):
+    """
+    Modalità servizio: un solo processo (un solo import di OpenCV/NumPy) per
+    molte immagini. Legge da stdin una riga per compito, "input<TAB>output<TAB>side"
+    (output e side opzionali, side vuoto = rilevamento automatico), e al termine
+    di ogni compito scrive su stdout una riga "[DONE] ..." oppure "[ERROR] ...".
+    I messaggi diagnostici di process_one vanno su stderr, così stdout contiene
+    solo le righe di stato. Termina alla chiusura di stdin.
+    """
+    for line in sys.stdin:
+        line = line.rstrip('\r\n')
+        if not line:
+            continue
+        fields = line.split('\t')
+        input_path = fields[0]
+        out_path = fields[1] if len(fields) > 1 and fields[1] else None
+        side = fields[2] if len(fields) > 2 and fields[2] else None
+        try:
+            with redirect_stdout(sys.stderr):
+                message = process_one(input_path, out_path, side=side, debug=debug, use_opencl=use_opencl)
+            status = f"[DONE] {message}"
+        except Exception as e:
+            status = f"[ERROR] {input_path}: {e}"
+        print(status, flush=True)
+
+# =======================
+# MAIN SCRIPT
+# =======================
+
+def main():
+    """
+    Parsing degli argomenti, caricamento immagine, rilevamento piega, crop, rotazione e salvataggio.
+    Se input è una cartella, elabora tutte le immagini contenute (out è la cartella di output).
+    """
+    p = argparse.ArgumentParser()
+    p.add_argument("input", nargs='?')
+    p.add_argument("--side", choices=('left','right'), default=None)
+    p.add_argument("out", nargs='?')
+    p.add_argument("--debug", action='store_true')
+    p.add_argument("--workers", type=int, default=None,
+                   help="Processi paralleli quando input è una cartella (default: numero di CPU)")
+    p.add_argument("--use-opencl", action='store_true',
+                   help="Esegue grigio e sfocatura della ROI con OpenCL, se disponibile")
+    p.add_argument("--server", action='store_true',
+                   help="Resta attivo e legge i compiti da stdin (input<TAB>output<TAB>side per riga)")
+    args = p.parse_args()
+
+    if args.server:
+        serve(debug=args.debug, use_opencl=args.use_opencl)
+        return
+    if not args.input:
+        p.error("serve un file o una cartella di input (oppure --server)")
+
+    if os.path.isdir(args.input):
+        if not args.out:
+            p.error("con una cartella di input serve la cartella di output")
+        errors = process_folder(args.input, args.out, side=args.side, debug=args.debug,
+                                workers=args.workers, use_opencl=args.use_opencl)
+        raise SystemExit(1 if errors else 0)
+
+    process_one(args.input, args.out, side=args.side, debug=args.debug, use_opencl=args.use_opencl)
 
 if __name__=="__main__":
     main()
\ No newline at end of file
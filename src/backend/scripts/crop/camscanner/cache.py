@@ -0,0 +1,120 @@
+"""
+On-disk cache for detector outputs.
+
+Page boundary and fold detection dominate the cost of a scan, and their
+results depend only on the image pixels and a handful of detector settings.
+Caching them by content hash lets repeated batch runs (e.g. while tuning
+classification thresholds) skip detection entirely.
+"""
+
+import hashlib
+import os
+from pathlib import Path
+from typing import Optional, Tuple, Union
+
+import numpy as np
+
+try:
+    import xxhash
+except ImportError:
+    xxhash = None
+
+
+# (page_contour, page_angle, fold_x, fold_quality, fold_method)
+Features = Tuple[Optional[np.ndarray], Optional[float], Optional[int], float, Optional[str]]
+
+
+def _hash_bytes(data) -> str:
+    """Fast content hash (xxh3 when available, blake2b otherwise)."""
+    if xxhash is not None:
+        return xxhash.xxh3_64(data).hexdigest()
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+class DetectionCache:
+    """
+    Content-addressed store of detector features, one .npz file per image.
+    """
+
+    def __init__(self, cache_dir: Union[str, Path], params: tuple):
+        """
+        Initialize cache.
+
+        Args:
+            cache_dir: Directory holding cached entries (created if missing)
+            params: Detector settings that affect the cached features
+        """
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.params_key = _hash_bytes(repr(params).encode())[:8]
+
+    def key(self, img: np.ndarray) -> str:
+        """
+        Build cache key from image content, shape and detector settings.
+
+        Args:
+            img: Input image
+
+        Returns:
+            str: Cache key
+        """
+        img = np.ascontiguousarray(img)
+        shape_key = "x".join(str(d) for d in img.shape)
+        return f"{_hash_bytes(img.data)}_{shape_key}_{self.params_key}"
+
+    def load(self, key: str) -> Optional[Features]:
+        """
+        Load cached features.
+
+        Args:
+            key: Cache key from key()
+
+        Returns:
+            Cached features tuple, or None on miss
+        """
+        path = self.cache_dir / f"{key}.npz"
+        if not path.exists():
+            return None
+
+        try:
+            with np.load(path) as data:
+                page_contour = data['page_contour']
+                page_angle = float(data['page_angle'])
+                fold_x = int(data['fold_x'])
+                fold_quality = float(data['fold_quality'])
+                fold_method = str(data['fold_method'])
+        except Exception:
+            # Corrupt or partial entry: treat as miss, it will be rewritten
+            return None
+
+        return (
+            page_contour if page_contour.size else None,
+            None if np.isnan(page_angle) else page_angle,
+            None if fold_x < 0 else fold_x,
+            fold_quality,
+            fold_method or None
+        )
+
+    def save(self, key: str, features: Features):
+        """
+        Store features atomically (safe with concurrent worker processes).
+
+        Args:
+            key: Cache key from key()
+            features: Features tuple to store
+        """
+        page_contour, page_angle, fold_x, fold_quality, fold_method = features
+
+        path = self.cache_dir / f"{key}.npz"
+        tmp_path = self.cache_dir / f"{key}.{os.getpid()}.tmp"
+
+        with open(tmp_path, 'wb') as f:
+            np.savez(
+                f,
+                page_contour=page_contour if page_contour is not None else np.empty((0, 1, 2), np.int32),
+                page_angle=np.nan if page_angle is None else page_angle,
+                fold_x=-1 if fold_x is None else fold_x,
+                fold_quality=fold_quality,
+                fold_method=fold_method or ''
+            )
+        os.replace(tmp_path, path)
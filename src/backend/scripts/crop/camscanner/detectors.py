@@ -7,19 +7,41 @@ Automatically detects whether input is:
 - Partial book (one page + lateral fold to crop)
 """
 
+import functools
+
+import cv2
 import numpy as np
-from typing import Tuple, Dict, Optional
+from typing import Tuple, Dict, Optional, List, Iterable
 
 from .utils import (
     detect_page_boundary,
     get_contour_bounds,
-    get_page_center_x,
-    get_page_width,
+    contour_metrics,
+    batch_contour_metrics,
+    to_gray,
     calculate_fold_position_ratio,
     page_covers_full_image,
-    is_valid_contour
+    is_valid_contour,
+    contour_stats
 )
 from .fold_detection_hough import detect_fold_combined
+from .cache import DetectionCache, Features
+
+
+@functools.lru_cache(maxsize=256)
+def _contour_geometry(contour_bytes: bytes, dtype: str, fold_x: int) -> Tuple[float, int, int]:
+    """
+    Memoized contour_metrics, keyed on the raw contour bytes.
+
+    Repeated detect() calls on the same image (e.g. threshold sweeps) reuse
+    the fold ratio, page width and page center instead of recomputing them.
+    """
+    contour = np.frombuffer(contour_bytes, dtype=dtype)
+    return contour_metrics(fold_x, contour)
+
+
+def _noop(*args, **kwargs):
+    """Debug sink used when debug output is disabled."""
 
 
 class DocumentTypeDetector:
@@ -39,14 +61,47 @@ class DocumentTypeDetector:
         """
         self.config = config or {}
         self.quality_threshold = self.config.get('quality_threshold', 0.6)
+        self.early_exit_quality = self.config.get('early_exit_quality', 0.85)
+        self.exhaustive_fold_search = self.config.get('exhaustive_fold_search', False)
+        # Edge column projection instead of Hough voting when its peak is clear
+        self.fast_mode = self.config.get('fast_mode', False)
+        # Brightness fold quality that makes Hough detection unnecessary
+        self.fold_high_confidence = self.config.get('fold_high_confidence', 0.8)
+        # Long-side limit for the detection image (geometry doesn't need more)
+        self.detect_max_dim = self.config.get('detect_max_dim', 1500)
         self.debug = self.config.get('debug', False)
+        # Constant debug messages go through _dbg (a no-op unless debugging);
+        # formatted ones stay behind `if self.debug:` so f-strings aren't built
+        self._dbg = print if self.debug else _noop
+
+        # Optional on-disk cache of detector outputs, keyed by image content
+        cache_dir = self.config.get('cache_dir')
+        self.cache = DetectionCache(cache_dir, self._cache_params()) if cache_dir else None
+
+    def _cache_params(self) -> tuple:
+        """Detector settings that change the cached features."""
+        return (
+            self.quality_threshold,
+            self.early_exit_quality,
+            self.exhaustive_fold_search,
+            self.detect_max_dim,
+            self.fast_mode,
+            self.fold_high_confidence
+        )
 
-    def detect(self, img: np.ndarray) -> Tuple[str, float, Dict]:
+    def detect(
+        self,
+        img: np.ndarray,
+        detect_img: Optional[np.ndarray] = None
+    ) -> Tuple[str, float, Dict]:
         """
         Detect document type from image.
 
         Args:
             img: Input image (BGR)
+            detect_img: Optional reduced-resolution decode of the same image
+                (e.g. cv2.IMREAD_REDUCED_COLOR_2) to run detection on instead
+                of resizing img. Results are still in img coordinates.
 
         Returns:
             tuple: (document_type, confidence, metadata)
@@ -59,45 +114,126 @@ class DocumentTypeDetector:
         if self.debug:
             print(f"\n[Detector] Analyzing image: {w}x{h}")
 
-        # Step 1: Detect page boundary
-        page_contour, angle = detect_page_boundary(img, debug=self.debug)
+        # Steps 1-2: page boundary + fold detection
+        features = self._get_features(img, detect_img)
+        page_contour, angle, fold_x, fold_quality, fold_method = features
 
-        if page_contour is None or not is_valid_contour(page_contour, img.shape):
-            if self.debug:
-                print("[Detector] No valid page boundary detected")
+        if page_contour is None:
             return "unknown", 0.0, {"reason": "no_page_boundary"}
 
-        if self.debug:
-            print(f"[Detector] Page boundary detected (angle={angle:.2f}°)")
+        # Step 3: Classify based on fold detection
+        doc_type, confidence, classification_info = self._classify_document(
+            img, page_contour, fold_x, fold_quality
+        )
 
-        # Step 2: Detect fold lines by searching center, left, and right
-        detections = []
-        for side in ["center", "left", "right"]:
-            if self.debug:
-                print(f"\n[Detector] Searching for fold on '{side}' side...")
-            fold_x_candidate, fold_quality_candidate, fold_method_candidate = detect_fold_combined(
-                img, side=side, debug=self.debug
-            )
-            if fold_x_candidate is not None:
-                detections.append((fold_x_candidate, fold_quality_candidate, fold_method_candidate))
+        return self._build_result(features, doc_type, confidence, classification_info)
 
-        if not detections:
-            fold_x, fold_quality, fold_method = None, 0.0, None
-        else:
-            # Select best fold based on quality score
-            fold_x, fold_quality, fold_method = max(detections, key=lambda item: item[1])
+    def detect_batch(self, imgs: Iterable[np.ndarray]) -> List[Tuple[str, float, Dict]]:
+        """
+        Detect document types for a batch of images.
 
-        if self.debug:
-            if fold_x is not None:
-                print(f"\n[Detector] Best fold detected at x={fold_x} (quality={fold_quality:.3f}, method={fold_method})")
-            else:
-                print("\n[Detector] No fold detected in any region")
+        Boundary and fold detection still run per image (OpenCV work is not
+        batchable), but the contour geometry used for classification is
+        computed for the whole batch in one vectorized pass.
 
-        # Step 3: Classify based on fold detection
-        doc_type, confidence, classification_info = self._classify_document(
-            img, page_contour, fold_x, fold_quality
+        Args:
+            imgs: Input images (BGR). Consumed lazily, so a generator fed by
+                background readers overlaps decoding with detection.
+
+        Returns:
+            list: (document_type, confidence, metadata) per image, same order as imgs
+        """
+        consumed = []
+        all_features = []
+        for img in imgs:
+            consumed.append(img)
+            all_features.append(self._get_features(img))
+        imgs = consumed
+
+        results = [
+            ("unknown", 0.0, {"reason": "no_page_boundary"})
+            for _ in all_features
+        ]
+
+        found = [i for i, features in enumerate(all_features) if features[0] is not None]
+        if not found:
+            return results
+
+        contours = np.stack([all_features[i][0].reshape(-1, 2) for i in found])
+        img_shapes = np.array([imgs[i].shape[:2] for i in found])
+        fold_xs = np.array([
+            np.nan if all_features[i][2] is None else all_features[i][2]
+            for i in found
+        ])
+
+        coverage, ratios, widths, centers = batch_contour_metrics(
+            contours, img_shapes, fold_xs, coverage_threshold=0.85
         )
 
+        for j, i in enumerate(found):
+            features = all_features[i]
+            page_contour, _, fold_x, fold_quality, _ = features
+
+            doc_type, confidence, classification_info = self._classify_document(
+                imgs[i], page_contour, fold_x, fold_quality,
+                metrics=(float(ratios[j]), int(widths[j]), int(centers[j]), bool(coverage[j]))
+            )
+            results[i] = self._build_result(features, doc_type, confidence, classification_info)
+
+        return results
+
+    def _get_features(
+        self,
+        img: np.ndarray,
+        detect_img: Optional[np.ndarray] = None
+    ) -> Features:
+        """
+        Get detector features, served from the on-disk cache when possible.
+
+        Args:
+            img: Input image (BGR)
+            detect_img: Optional reduced-resolution decode of img
+
+        Returns:
+            tuple: (page_contour, page_angle, fold_x, fold_quality, fold_method)
+        """
+        features = None
+        if self.cache is not None:
+            cache_key = self.cache.key(img)
+            if detect_img is not None:
+                cache_key += f"_r{detect_img.shape[1]}"
+            features = self.cache.load(cache_key)
+            if self.debug and features is not None:
+                print(f"[Detector] Cache hit ({cache_key})")
+
+        if features is None:
+            features = self._detect_features(img, detect_img)
+            if self.cache is not None:
+                self.cache.save(cache_key, features)
+
+        return features
+
+    def _build_result(
+        self,
+        features: Features,
+        doc_type: str,
+        confidence: float,
+        classification_info: Dict
+    ) -> Tuple[str, float, Dict]:
+        """
+        Assemble detect() output from features and classification.
+
+        Args:
+            features: Detector features
+            doc_type: Document type
+            confidence: Classification confidence
+            classification_info: Info dict from classification
+
+        Returns:
+            tuple: (document_type, confidence, metadata)
+        """
+        page_contour, angle, fold_x, fold_quality, fold_method = features
+
         # Prepare metadata
         metadata = {
             'page_contour': page_contour,
@@ -113,12 +249,130 @@ class DocumentTypeDetector:
 
         return doc_type, confidence, metadata
 
+    def _detect_features(
+        self,
+        img: np.ndarray,
+        detect_img: Optional[np.ndarray] = None
+    ) -> Features:
+        """
+        Run page boundary and fold detection (the expensive part of detect).
+
+        Args:
+            img: Input image (BGR)
+            detect_img: Optional reduced-resolution decode of img
+
+        Returns:
+            tuple: (page_contour, page_angle, fold_x, fold_quality, fold_method)
+                - page_contour is None if no valid page boundary was found
+                - coordinates are always in the original image space
+        """
+        h, w = img.shape[:2]
+        small = img if detect_img is None else detect_img
+
+        sh, sw = small.shape[:2]
+        scale = min(1.0, self.detect_max_dim / max(sh, sw)) if self.detect_max_dim else 1.0
+        if scale < 1.0:
+            small = cv2.resize(small, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+
+        if small is img:
+            return self._detect_features_at_scale(img)
+
+        # Per-axis scale: reduced decodes round dimensions up
+        scale_x = small.shape[1] / w
+        scale_y = small.shape[0] / h
+
+        if self.debug:
+            print(f"[Detector] Detecting on downscaled image: {small.shape[1]}x{small.shape[0]} (scale={scale_x:.3f})")
+
+        page_contour, angle, fold_x, fold_quality, fold_method = self._detect_features_at_scale(small)
+
+        # Map detection results back to original resolution
+        if page_contour is not None:
+            page_contour = np.round(
+                page_contour / np.array([scale_x, scale_y])
+            ).astype(page_contour.dtype)
+        if fold_x is not None:
+            fold_x = int(fold_x / scale_x)
+
+        return page_contour, angle, fold_x, fold_quality, fold_method
+
+    def _detect_features_at_scale(self, img: np.ndarray) -> Features:
+        """
+        Run detection on img as given, without any resizing.
+
+        Args:
+            img: Detection image (BGR)
+
+        Returns:
+            tuple: (page_contour, page_angle, fold_x, fold_quality, fold_method)
+        """
+        # Convert once; shared by boundary detection and every fold search
+        gray = to_gray(img)
+
+        # Step 1: Detect page boundary
+        page_contour, angle = detect_page_boundary(img, debug=self.debug, gray=gray)
+
+        # Bounds and area computed once for the validity and fold-ratio checks
+        stats = contour_stats(page_contour) if page_contour is not None else None
+        if page_contour is None or not is_valid_contour(page_contour, img.shape, stats):
+            self._dbg("[Detector] No valid page boundary detected")
+            return None, None, None, 0.0, None
+
+        if self.debug:
+            print(f"[Detector] Page boundary detected (angle={angle:.2f}°)")
+
+        # Step 2: Detect fold lines by searching center, left, and right
+        # (stops early on a confident hit unless exhaustive search is requested)
+        best_q = -1.0
+        best = (None, 0.0, None)
+        for side in ["center", "left", "right"]:
+            if self.debug:
+                print(f"\n[Detector] Searching for fold on '{side}' side...")
+            fold_x_candidate, fold_quality_candidate, fold_method_candidate = detect_fold_combined(
+                img, side=side, debug=self.debug, gray=gray, fast_mode=self.fast_mode,
+                high_confidence_threshold=self.fold_high_confidence
+            )
+            if fold_x_candidate is None:
+                continue
+
+            # Keep best fold based on quality score
+            if fold_quality_candidate > best_q:
+                best_q = fold_quality_candidate
+                best = (fold_x_candidate, fold_quality_candidate, fold_method_candidate)
+
+            if self.exhaustive_fold_search:
+                continue
+
+            if fold_quality_candidate >= self.early_exit_quality:
+                if self.debug:
+                    print(f"[Detector] Early exit on '{side}' (quality={fold_quality_candidate:.3f})")
+                break
+
+            # A good central fold lands in the book-spread branch regardless of
+            # what the lateral searches find
+            if side == "center" and fold_quality_candidate > self.quality_threshold:
+                fold_ratio = calculate_fold_position_ratio(fold_x_candidate, page_contour, stats)
+                if 0.4 <= fold_ratio <= 0.6:
+                    if self.debug:
+                        print(f"[Detector] Central fold (ratio={fold_ratio:.2f}), skipping lateral search")
+                    break
+
+        fold_x, fold_quality, fold_method = best
+
+        if best_q < 0:
+            self._dbg("\n[Detector] No fold detected in any region")
+        elif self.debug:
+            print(f"\n[Detector] Best fold detected at x={fold_x} (quality={fold_quality:.3f}, method={fold_method})")
+
+        return page_contour, angle, fold_x, fold_quality, fold_method
+
     def _classify_document(
         self,
         img: np.ndarray,
         page_contour: np.ndarray,
         fold_x: Optional[int],
-        fold_quality: float
+        fold_quality: float,
+        metrics: Optional[Tuple[float, int, int, bool]] = None
     ) -> Tuple[str, float, Dict]:
         """
         Classify document based on page boundary and fold detection.
@@ -128,6 +382,8 @@ class DocumentTypeDetector:
             page_contour: Detected page contour (4 corners)
             fold_x: Detected fold x position (None if not found)
             fold_quality: Fold detection quality score
+            metrics: Precomputed (fold_ratio, page_width, page_center_x, page_coverage),
+                as produced by detect_batch (None = compute here)
 
         Returns:
             tuple: (document_type, confidence, info_dict)
@@ -137,18 +393,21 @@ class DocumentTypeDetector:
 
         # No fold detected → single document
         if fold_x is None or fold_quality < self.quality_threshold:
-            if self.debug:
-                if fold_x is None:
-                    print("[Classifier] No fold → single document")
-                else:
-                    print(f"[Classifier] Fold quality too low ({fold_quality:.3f} < {self.quality_threshold}) → single document")
+            if fold_x is None:
+                self._dbg("[Classifier] No fold → single document")
+            elif self.debug:
+                print(f"[Classifier] Fold quality too low ({fold_quality:.3f} < {self.quality_threshold}) → single document")
 
             return "single", 0.8, info
 
         # Fold detected → determine position relative to page
-        fold_ratio = calculate_fold_position_ratio(fold_x, page_contour)
-        page_width = get_page_width(page_contour)
-        page_center_x = get_page_center_x(page_contour)
+        if metrics is not None:
+            fold_ratio, page_width, page_center_x, page_coverage = metrics
+        else:
+            fold_ratio, page_width, page_center_x = _contour_geometry(
+                page_contour.tobytes(), page_contour.dtype.str, int(fold_x)
+            )
+            page_coverage = None
 
         info['fold_ratio'] = fold_ratio
         info['page_width'] = page_width
@@ -160,19 +419,19 @@ class DocumentTypeDetector:
 
         # Case 1: Fold at page center (0.4-0.6) → book spread
         if 0.4 <= fold_ratio <= 0.6:
-            return self._classify_book_spread(img, page_contour, fold_x, fold_quality, info)
+            return self._classify_book_spread(
+                img, page_contour, fold_x, fold_quality, info, page_coverage=page_coverage
+            )
 
         # Case 2: Fold at left edge (< 0.2) → partial book (left page visible)
         elif fold_ratio < 0.2:
-            if self.debug:
-                print("[Classifier] Fold at left edge → partial_left")
+            self._dbg("[Classifier] Fold at left edge → partial_left")
             info['fold_side'] = 'left'
             return "partial_left", fold_quality, info
 
         # Case 3: Fold at right edge (> 0.8) → partial book (right page visible)
         elif fold_ratio > 0.8:
-            if self.debug:
-                print("[Classifier] Fold at right edge → partial_right")
+            self._dbg("[Classifier] Fold at right edge → partial_right")
             info['fold_side'] = 'right'
             return "partial_right", fold_quality, info
 
@@ -189,7 +448,8 @@ class DocumentTypeDetector:
         page_contour: np.ndarray,
         fold_x: int,
         fold_quality: float,
-        info: Dict
+        info: Dict,
+        page_coverage: Optional[bool] = None
     ) -> Tuple[str, float, Dict]:
         """
         Classify book spread and check for warnings.
@@ -200,12 +460,14 @@ class DocumentTypeDetector:
             fold_x: Fold x position
             fold_quality: Fold quality score
             info: Info dict to populate
+            page_coverage: Precomputed coverage check (None = compute here)
 
         Returns:
             tuple: (document_type, confidence, updated_info)
         """
         # Check if page covers full image (indicates both pages visible)
-        page_coverage = page_covers_full_image(page_contour, img.shape, threshold=0.85)
+        if page_coverage is None:
+            page_coverage = page_covers_full_image(page_contour, img.shape, threshold=0.85)
         info['page_coverage'] = page_coverage
 
         if page_coverage:
@@ -215,16 +477,14 @@ class DocumentTypeDetector:
                 "Consider photographing pages individually for better quality."
             ]
 
-            if self.debug:
-                print("[Classifier] WARNING: Full book spread (both pages visible)")
+            self._dbg("[Classifier] WARNING: Full book spread (both pages visible)")
 
             # Lower confidence due to suboptimal capture
             confidence = fold_quality * 0.7
 
         else:
             # Partial book spread (only one page visible, center fold detected)
-            if self.debug:
-                print("[Classifier] Partial book spread (single page with center fold)")
+            self._dbg("[Classifier] Partial book spread (single page with center fold)")
 
             confidence = fold_quality
 
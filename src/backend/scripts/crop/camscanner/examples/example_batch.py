@@ -3,27 +3,83 @@
 Example: Batch process multiple images in a directory.
 
 Usage:
-    python example_batch.py <input_dir> <output_dir>
+    python example_batch.py <input_dir> <output_dir> [--cache-dir DIR] [--batch-size N]
 """
 
+import argparse
+import csv
+import os
 import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
 
+import numpy as np
+
 # Add parent directory to path
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
 from camscanner import CamScanner
+from camscanner.utils import configure_opencv_threads
 
 
-def main():
-    if len(sys.argv) < 3:
-        print("Usage: python example_batch.py <input_dir> <output_dir>")
-        print("\nExample:")
-        print("  python example_batch.py ./images/ ./scanned/")
-        sys.exit(1)
+# Per-process scanner, created once by _init_worker
+_scanner = None
+
+
+def _init_worker(cfg: dict):
+    """
+    Build the worker's scanner once and warm it up.
+
+    Scanning a tiny blank image triggers OpenCV initialization and lazy
+    imports before the first real image, so they are paid once per process.
+    """
+    global _scanner
+    # Parallelism comes from the process pool: one OpenCV thread per worker
+    configure_opencv_threads(1)
+    _scanner = CamScanner(**cfg)
+    _scanner.scan_array(np.zeros((64, 64, 3), dtype=np.uint8))
+
+
+def _worker(path_strs: list, out_dir_str: str):
+    """
+    Scan and save a chunk of images inside a pool worker process.
+
+    Returns small picklable summaries instead of ScanResults, so the
+    processed images never cross the process boundary.
+    """
+    results = _scanner.scan_batch(path_strs)
+
+    summaries = []
+    for path_str, result in zip(path_strs, results):
+        if result.success:
+            result.save(Path(out_dir_str) / Path(path_str).name)
+        summaries.append(
+            (path_str, result.success, result.document_type, result.confidence, result.warnings)
+        )
+
+    return summaries
 
-    input_dir = Path(sys.argv[1])
-    output_dir = Path(sys.argv[2])
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Batch process all images in a directory with CamScanner",
+        epilog="Example: python example_batch.py ./images/ ./scanned/"
+    )
+    parser.add_argument("input_dir", help="Directory containing input images")
+    parser.add_argument("output_dir", help="Directory for scanned output")
+    parser.add_argument(
+        "--cache-dir",
+        help="Detection cache directory (default: <output_dir>/.camscanner_cache)"
+    )
+    parser.add_argument(
+        "--batch-size", type=int, default=8,
+        help="Images per worker task, classified together (default: 8)"
+    )
+    args = parser.parse_args()
+
+    input_dir = Path(args.input_dir)
+    output_dir = Path(args.output_dir)
+    cache_dir = Path(args.cache_dir) if args.cache_dir else output_dir / ".camscanner_cache"
 
     if not input_dir.exists():
         print(f"Error: Input directory not found: {input_dir}")
@@ -32,12 +88,12 @@ def main():
     # Create output directory
     output_dir.mkdir(parents=True, exist_ok=True)
 
-    # Find all images
-    image_extensions = ['.jpg', '.jpeg', '.png', '.tiff', '.tif']
-    image_files = []
-    for ext in image_extensions:
-        image_files.extend(input_dir.glob(f"*{ext}"))
-        image_files.extend(input_dir.glob(f"*{ext.upper()}"))
+    # Find all images (single directory pass, case-insensitive extensions)
+    image_extensions = {'.jpg', '.jpeg', '.png', '.tiff', '.tif'}
+    image_files = sorted(
+        Path(entry.path) for entry in os.scandir(input_dir)
+        if entry.is_file() and os.path.splitext(entry.name)[1].lower() in image_extensions
+    )
 
     if not image_files:
         print(f"No images found in {input_dir}")
@@ -48,63 +104,90 @@ def main():
     print("=" * 60)
     print(f"Input directory: {input_dir}")
     print(f"Output directory: {output_dir}")
-    print(f"Found {len(image_files)} images\n")
-
-    # Create scanner
-    scanner = CamScanner(debug=False)
-
-    # Process each image
+    print(f"Cache directory: {cache_dir}")
+    num_images = len(image_files)
+    print(f"Found {num_images} images\n")
+
+    # Scanner config (plain dict so it can be pickled to worker processes)
+    cfg = {'debug': False, 'cache_dir': str(cache_dir)}
+    workers = os.cpu_count() or 1
+    print(f"Workers: {workers}\n")
+
+    # Process images in parallel
+    batches = [
+        image_files[i:i + args.batch_size]
+        for i in range(0, len(image_files), args.batch_size)
+    ]
+
+    with ProcessPoolExecutor(
+        max_workers=workers, initializer=_init_worker, initargs=(cfg,)
+    ) as ex:
+        futures = [
+            ex.submit(_worker, [str(p) for p in batch], str(output_dir))
+            for batch in batches
+        ]
+
+        # Per-image outcomes, one column per field, rendered once at the end
+        index = {str(p): i for i, p in enumerate(image_files)}
+        name_len = max(len(p.name) for p in image_files)
+        records = np.empty(num_images, dtype=[
+            ('name', f'U{name_len}'),
+            ('ok', '?'),
+            ('doc_type', 'U16'),
+            ('confidence', 'f4')
+        ])
+
+        done = 0
+        for future in as_completed(futures):
+            for path_str, success, doc_type, confidence, warnings in future.result():
+                records[index[path_str]] = (Path(path_str).name, success, doc_type, confidence)
+
+                if not success:
+                    reason = warnings[0] if warnings else 'Unknown error'
+                    sys.stdout.write(f"\r  Failed: {Path(path_str).name}: {reason}\n")
+
+                done += 1
+                if done % 64 == 0 or done == num_images:
+                    sys.stdout.write(f"\rProcessed {done}/{num_images}")
+                    sys.stdout.flush()
+
+    print("\n")
+
+    # Per-image report
+    report_path = output_dir / "scan_results.csv"
+    # csv.writer quotes filenames containing commas or quotes
+    with open(report_path, 'w', newline='') as f:
+        writer = csv.writer(f, lineterminator='\n')
+        writer.writerow(('name', 'ok', 'document_type', 'confidence'))
+        writer.writerows(
+            (name, int(ok), doc_type, f'{confidence:.3f}')
+            for name, ok, doc_type, confidence in records.tolist()
+        )
+
+    # Tally statistics once at the end
+    types, counts = np.unique(records['doc_type'][records['ok']], return_counts=True)
+    type_counts = dict(zip(types, counts))
+    num_success = int(records['ok'].sum())
     results = {
-        'success': 0,
-        'failed': 0,
-        'single': 0,
-        'book_spread': 0,
-        'partial': 0
+        'success': num_success,
+        'failed': num_images - num_success,
+        'single': type_counts.get('single', 0),
+        'book_spread': type_counts.get('book_spread', 0),
+        'partial': type_counts.get('partial_left', 0) + type_counts.get('partial_right', 0)
     }
 
-    for i, image_path in enumerate(image_files, 1):
-        print(f"[{i}/{len(image_files)}] Processing: {image_path.name}")
-
-        # Process image
-        result = scanner.scan(str(image_path))
-
-        # Update statistics
-        if result.success:
-            results['success'] += 1
-            if result.document_type == 'single':
-                results['single'] += 1
-            elif result.document_type == 'book_spread':
-                results['book_spread'] += 1
-            elif result.document_type in ['partial_left', 'partial_right']:
-                results['partial'] += 1
-        else:
-            results['failed'] += 1
-
-        # Save result
-        if result.success:
-            output_path = output_dir / image_path.name
-            result.save(output_path)
-            print(f"  Type: {result.document_type}, Confidence: {result.confidence:.2f}")
-
-            if result.warnings:
-                for warning in result.warnings:
-                    print(f"  Warning: {warning}")
-        else:
-            print(f"  Failed: {result.warnings[0] if result.warnings else 'Unknown error'}")
-
-        print()
-
     # Print summary
     print("=" * 60)
     print("SUMMARY")
     print("=" * 60)
-    print(f"Total images: {len(image_files)}")
+    print(f"Total images: {num_images}")
     print(f"Successfully processed: {results['success']}")
     print(f"Failed: {results['failed']}")
     print(f"\nDocument types:")
     print(f"  Single documents: {results['single']}")
     print(f"  Book spreads: {results['book_spread']}")
     print(f"  Partial books: {results['partial']}")
+    print(f"\nPer-image report: {report_path}")
     print("=" * 60)
 
 
@@ -7,9 +7,42 @@ is not significantly darker than pages (e.g., light-colored books).
 Detects strong vertical lines that may indicate book fold or page edge.
 """
 
+import math
+import threading
+
 import cv2
 import numpy as np
-from typing import Tuple, Optional, List, Dict
+from dataclasses import dataclass
+from typing import Tuple, Optional
+
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+
+# Per-thread scratch buffers reused across calls (never returned to callers)
+_scratch = threading.local()
+
+
+ANGLE_THRESHOLD = 15  # Max degrees from vertical for a fold line
+_TAN_ANGLE_THRESHOLD = math.tan(math.radians(ANGLE_THRESHOLD))
+
+# Fast mode: minimum peak/mean ratio of the edge column projection to trust it
+FAST_MODE_MIN_PROMINENCE = 3.0
+
+
+@dataclass
+class LineSet:
+    """Detected line segments stored as parallel arrays (one entry per line)."""
+    x: np.ndarray       # Average x position
+    length: np.ndarray  # Segment length in pixels
+    dx: np.ndarray      # Horizontal extent (x2 - x1)
+    dy: np.ndarray      # Vertical extent (y2 - y1)
+
+    def angles(self, idx: np.ndarray) -> np.ndarray:
+        """Degrees from vertical of the selected lines."""
+        return np.degrees(np.arctan2(np.abs(self.dx[idx]), np.abs(self.dy[idx])))
 
 
 def detect_fold_hough_lines(
@@ -17,7 +50,9 @@ def detect_fold_hough_lines(
     side: str = "center",
     search_ratio: float = 0.3,
     min_line_length: Optional[int] = None,
-    debug: bool = False
+    debug: bool = False,
+    gray: Optional[np.ndarray] = None,
+    fast_mode: bool = False
 ) -> Tuple[Optional[int], float]:
     """
     Detect book fold/spine using Hough Line Transform for vertical lines.
@@ -26,8 +61,12 @@ def detect_fold_hough_lines(
         img: Input image (BGR or grayscale)
         side: Expected fold location - 'left', 'right', or 'center'
         search_ratio: Fraction of image width to search (0.3 = middle 30%)
-        min_line_length: Minimum line length in pixels (None = auto from height)
+        min_line_length: Minimum line length in full-resolution pixels
+            (None = auto from height)
         debug: Print debug information
+        gray: Precomputed grayscale of img (optional, skips conversion)
+        fast_mode: Try the edge column projection first, falling back to
+            Hough voting only when its peak is not prominent enough
 
     Returns:
         tuple: (fold_x_position, quality_score)
@@ -36,11 +75,18 @@ def detect_fold_hough_lines(
     """
     h, w = img.shape[:2]
 
-    # Convert to grayscale if needed
-    if len(img.shape) == 3:
-        gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
-    else:
-        gray = img.copy()
+    # Convert to grayscale if needed (grayscale input is only read, no copy)
+    if gray is None:
+        gray = img if img.ndim == 2 else _gray_scratch(img)
+
+    # Detect on a reduced copy of large scans: Canny and Hough voting scale
+    # with pixel count, while the fold only needs a few-pixel accurate x
+    scale = max(1, min(w, h) // 1024)
+    if scale > 1:
+        gray = cv2.resize(gray, (w // scale, h // scale), interpolation=cv2.INTER_AREA)
+        if min_line_length is not None:
+            min_line_length = max(1, min_line_length // scale)
+        h, w = gray.shape[:2]
 
     # Define search region based on expected fold location
     if side == "left":
@@ -57,16 +103,52 @@ def detect_fold_hough_lines(
     search_region = gray[:, x_start:x_end]
 
     if debug:
-        print(f"[Hough] Image size: {w}x{h}")
+        print(f"[Hough] Image size: {w}x{h} (detection scale 1/{scale})")
         print(f"[Hough] Search region: x={x_start} to x={x_end} (width={x_end-x_start})")
 
     # Edge detection (stronger edges for line detection)
-    edges = cv2.Canny(search_region, 50, 150, apertureSize=3)
+    edges = cv2.Canny(
+        search_region, 50, 150,
+        edges=_scratch_buffer('edges', search_region.shape, np.uint8),
+        apertureSize=3
+    )
 
     # Auto-calculate min_line_length if not provided
     if min_line_length is None:
         min_line_length = int(h * 0.4)  # Line must span at least 40% of height
 
+    cluster_threshold = w * 0.02  # 2% of width
+
+    # Fast mode: fold = column with the highest (smoothed) edge density
+    if fast_mode:
+        projection = _column_projection_peak(edges, max(3, w // 50))
+        if projection is not None and projection[1] >= FAST_MODE_MIN_PROMINENCE:
+            x_relative, prominence = projection
+            fold_x = int((x_relative + x_start) * scale)
+            quality = 1.0 - 1.0 / prominence
+
+            if debug:
+                print(f"[Hough] Column projection peak: prominence={prominence:.2f}")
+                print(f"[Hough] Fold detected at x={fold_x}, quality={quality:.3f}")
+
+            return fold_x, quality
+
+        if debug:
+            print("[Hough] Column projection peak not prominent, using Hough voting")
+
+    # Fast path: one dominant near-vertical line in the standard Hough accumulator
+    peak = _dominant_vertical_line(edges, min_line_length, cluster_threshold, ANGLE_THRESHOLD)
+    if peak is not None:
+        x_relative, votes, angle, num_peaks = peak
+        fold_x = int((x_relative + x_start) * scale)
+        quality = _quality_score(num_peaks, votes, angle, h, ANGLE_THRESHOLD)
+
+        if debug:
+            print(f"[Hough] Dominant accumulator peak: {votes:.0f} votes, angle={angle:.2f}°")
+            print(f"[Hough] Fold detected at x={fold_x}, quality={quality:.3f}")
+
+        return fold_x, quality
+
     # Detect lines using probabilistic Hough transform
     lines = cv2.HoughLinesP(
         edges,
@@ -82,120 +164,288 @@ def detect_fold_hough_lines(
             print("[Hough] No lines detected")
         return None, 0.0
 
-    # Filter for vertical lines (angle close to 90 degrees)
-    vertical_lines = []
-    angle_threshold = 15  # degrees from vertical
-
-    for line in lines:
-        x1, y1, x2, y2 = line[0]
+    # Filter for vertical lines (within ANGLE_THRESHOLD of vertical), all segments
+    # at once: |dx| <= tan(threshold) * |dy| avoids arctan2 on every segment
+    angle_threshold = ANGLE_THRESHOLD
+
+    segments = lines.reshape(-1, 4).astype(np.float32)
+    dx = segments[:, 2] - segments[:, 0]
+    dy = segments[:, 3] - segments[:, 1]
+    vertical = np.abs(dx) <= _TAN_ANGLE_THRESHOLD * np.abs(dy)
+
+    # Keep only near-vertical lines; lengths (the only sqrt) just for those
+    segments, dx, dy = segments[vertical], dx[vertical], dy[vertical]
+    vertical_lines = LineSet(
+        x=0.5 * (segments[:, 0] + segments[:, 2]),  # Average x position
+        length=np.hypot(dx, dy),
+        dx=dx,
+        dy=dy
+    )
 
-        # Calculate angle from vertical (0 = perfectly vertical)
-        if x2 - x1 == 0:
-            angle = 0  # Perfectly vertical
-        else:
-            angle = abs(90 - abs(np.degrees(np.arctan2(y2 - y1, x2 - x1))))
-
-        # Keep only near-vertical lines
-        if angle <= angle_threshold:
-            # Calculate line strength (length and straightness)
-            length = np.sqrt((x2 - x1)**2 + (y2 - y1)**2)
-            x_pos = (x1 + x2) / 2  # Average x position
-
-            vertical_lines.append({
-                'x': x_pos,
-                'x1': x1, 'y1': y1, 'x2': x2, 'y2': y2,
-                'length': length,
-                'angle': angle
-            })
-
-    if len(vertical_lines) == 0:
+    if vertical_lines.x.size == 0:
         if debug:
             print(f"[Hough] Found {len(lines)} lines but none vertical (within {angle_threshold}°)")
         return None, 0.0
 
     if debug:
-        print(f"[Hough] Found {len(vertical_lines)} vertical lines from {len(lines)} total")
+        print(f"[Hough] Found {vertical_lines.x.size} vertical lines from {len(lines)} total")
 
     # Cluster vertical lines by x position (lines close together = same spine)
-    cluster_threshold = w * 0.02  # 2% of width
-    clusters = _cluster_lines_by_position(vertical_lines, cluster_threshold)
+    # and keep the strongest cluster (most lines + longest combined length)
+    best_cluster, num_clusters = _select_best_cluster(vertical_lines, cluster_threshold)
 
     if debug:
-        print(f"[Hough] Clustered into {len(clusters)} groups")
-
-    # Find strongest cluster (most lines + longest combined length)
-    best_cluster = max(
-        clusters,
-        key=lambda c: len(c) + sum(l['length'] for l in c) / 1000
-    )
+        print(f"[Hough] Clustered into {num_clusters} groups")
 
     # Calculate fold position as weighted average (weight by length)
-    total_weight = sum(l['length'] for l in best_cluster)
-    fold_x_relative = sum(l['x'] * l['length'] for l in best_cluster) / total_weight
+    fold_x_relative = np.average(
+        vertical_lines.x[best_cluster], weights=vertical_lines.length[best_cluster]
+    )
 
     # Convert back to full image coordinates
-    fold_x = int(fold_x_relative + x_start)
+    fold_x = int((fold_x_relative + x_start) * scale)
 
     # Calculate quality score
-    quality = _calculate_line_quality(best_cluster, h, angle_threshold)
+    quality = _calculate_line_quality(vertical_lines, best_cluster, h, angle_threshold)
 
     if debug:
-        num_lines = len(best_cluster)
-        avg_length = sum(l['length'] for l in best_cluster) / num_lines
-        avg_angle = sum(l['angle'] for l in best_cluster) / num_lines
+        num_lines = best_cluster.size
+        avg_length = vertical_lines.length[best_cluster].mean()
+        avg_angle = vertical_lines.angles(best_cluster).mean()
         print(f"[Hough] Best cluster: {num_lines} lines, avg_length={avg_length:.1f}px, avg_angle={avg_angle:.2f}°")
         print(f"[Hough] Fold detected at x={fold_x}, quality={quality:.3f}")
 
     return fold_x, quality
 
 
-def _cluster_lines_by_position(lines: List[Dict], threshold: float) -> List[List[Dict]]:
+def _column_projection_peak(edges: np.ndarray, window: int) -> Optional[Tuple[int, float]]:
     """
-    Cluster lines by x position.
+    Find the column with the highest edge density in an edge map.
 
     Args:
-        lines: List of line dictionaries with 'x' key
+        edges: Edge map of the search region
+        window: Width of the box filter smoothing the column sums
+
+    Returns:
+        tuple: (x, prominence) of the peak column, prominence = peak / mean;
+        None if the region has no edges
+    """
+    col_edges = cv2.reduce(edges, 0, cv2.REDUCE_SUM, dtype=cv2.CV_32S).ravel()
+    smoothed = np.convolve(col_edges, np.full(window, 1.0 / window), mode='same')
+
+    mean = smoothed.mean()
+    if mean <= 0:
+        return None
+
+    x = int(np.argmax(smoothed))
+    return x, float(smoothed[x] / mean)
+
+
+def _dominant_vertical_line(
+    edges: np.ndarray,
+    min_votes: int,
+    cluster_threshold: float,
+    angle_threshold: float
+) -> Optional[Tuple[float, float, float, int]]:
+    """
+    Find a single dominant near-vertical line with the standard Hough transform.
+
+    The edge map is transposed so vertical lines sit around theta = 90°,
+    letting the theta sweep be restricted to +-angle_threshold.
+
+    Args:
+        edges: Edge map of the search region
+        min_votes: Minimum accumulator votes (edge pixels on the line)
+        cluster_threshold: Peaks closer than this count as the same line
+        angle_threshold: Maximum degrees from vertical
+
+    Returns:
+        tuple: (x, votes, angle, num_peaks) of the strongest line, x measured at
+        mid-height of the region; None if no peak is strong and unrivalled
+    """
+    max_offset = np.radians(angle_threshold)
+    peaks = cv2.HoughLinesWithAccumulator(
+        cv2.transpose(edges),
+        rho=1,
+        theta=np.pi/180,
+        threshold=min_votes,
+        min_theta=np.pi/2 - max_offset,
+        max_theta=np.pi/2 + max_offset
+    )
+    if peaks is None or len(peaks) == 0:
+        return None
+
+    # Peaks come sorted by votes; x of each line at mid-height (transposed x)
+    rho, theta, votes = peaks.reshape(-1, 3).T
+    cy = (edges.shape[0] - 1) / 2.0
+    xs = (rho - cy * np.cos(theta)) / np.sin(theta)
+
+    # Dominant: any peak elsewhere has less than half the top votes
+    same_line = np.abs(xs - xs[0]) <= cluster_threshold
+    rivals = votes[~same_line]
+    if rivals.size and rivals.max() >= 0.5 * votes[0]:
+        return None
+
+    angle = abs(np.degrees(theta[0]) - 90.0)
+    return float(xs[0]), float(votes[0]), float(angle), int(same_line.sum())
+
+
+def _scratch_buffer(name: str, shape: Tuple[int, ...], dtype) -> np.ndarray:
+    """
+    Get a per-thread buffer reused across calls while shape and dtype match.
+
+    Args:
+        name: Buffer name
+        shape: Required shape
+        dtype: Required dtype
+
+    Returns:
+        np.ndarray: Uninitialized buffer (overwritten by the next call in this thread)
+    """
+    buf = getattr(_scratch, name, None)
+    if buf is None or buf.shape != shape or buf.dtype != dtype:
+        buf = np.empty(shape, dtype=dtype)
+        setattr(_scratch, name, buf)
+    return buf
+
+
+def _gray_scratch(img: np.ndarray) -> np.ndarray:
+    """
+    Convert BGR image to grayscale into a per-thread buffer reused across calls.
+
+    Args:
+        img: BGR image
+
+    Returns:
+        np.ndarray: Grayscale image (overwritten by the next call in this thread)
+    """
+    buf = _scratch_buffer('gray', img.shape[:2], img.dtype)
+    return cv2.cvtColor(img, cv2.COLOR_BGR2GRAY, dst=buf)
+
+
+def _select_best_cluster(lines: LineSet, threshold: float) -> Tuple[np.ndarray, int]:
+    """
+    Cluster lines by x position and pick the strongest cluster in one sweep.
+
+    Lines are visited sorted by x: each line joins the current cluster if it
+    is within threshold of the cluster's running mean, otherwise the cluster
+    is closed and scored (line count + total length / 1000) and a new one
+    starts. Running sums replace any per-cluster intermediate arrays.
+
+    Args:
+        lines: Detected lines
         threshold: Maximum distance for same cluster
 
     Returns:
-        List of clusters (each cluster is a list of lines)
+        tuple: (members, num_clusters)
+            - members: Indices into lines of the strongest cluster
+            - num_clusters: Number of clusters found
     """
-    clusters = []
+    order = np.argsort(lines.x, kind='stable')
+    xs = lines.x[order].astype(np.float64)
+    lengths = lines.length[order].astype(np.float64)
+    if njit is None:
+        # Interpreted sweep: Python floats index faster than NumPy scalars
+        xs, lengths = xs.tolist(), lengths.tolist()
+
+    best_start, best_end, num_clusters = _cluster_sweep(xs, lengths, float(threshold))
+    return order[best_start:best_end], num_clusters
 
-    for line in sorted(lines, key=lambda x: x['x']):
-        placed = False
-        for cluster in clusters:
-            # Check if line belongs to existing cluster
-            cluster_center = np.mean([l['x'] for l in cluster])
-            if abs(line['x'] - cluster_center) <= threshold:
-                cluster.append(line)
-                placed = True
-                break
 
-        if not placed:
-            clusters.append([line])
+def _cluster_sweep(xs, lengths, threshold):
+    """
+    Running-mean clustering sweep behind _select_best_cluster.
 
-    return clusters
+    Scalar and branchy (each step depends on the running mean), so it is
+    compiled with numba when available instead of being vectorized.
 
+    Args:
+        xs: Line x positions, sorted
+        lengths: Line lengths, same order
+        threshold: Maximum distance from the cluster mean
 
-def _calculate_line_quality(cluster: List[Dict], img_height: int, angle_threshold: float) -> float:
+    Returns:
+        tuple: (best_start, best_end, num_clusters)
+    """
+    n = len(xs)
+    best_score = -1.0
+    best_start = 0
+    best_end = 0
+    num_clusters = 0
+    start = 0
+    sum_x = 0.0
+    sum_len = 0.0
+
+    for pos in range(n + 1):
+        count = pos - start
+        if count > 0 and (pos == n or abs(xs[pos] - sum_x / count) > threshold):
+            num_clusters += 1
+            score = count + sum_len / 1000
+            if score > best_score:
+                best_score = score
+                best_start = start
+                best_end = pos
+            start = pos
+            sum_x = 0.0
+            sum_len = 0.0
+
+        if pos < n:
+            sum_x += xs[pos]
+            sum_len += lengths[pos]
+
+    return best_start, best_end, num_clusters
+
+
+if njit is not None:
+    _cluster_sweep = njit(cache=True)(_cluster_sweep)
+
+
+def _calculate_line_quality(
+    lines: LineSet,
+    idx: np.ndarray,
+    img_height: int,
+    angle_threshold: float
+) -> float:
     """
     Calculate quality score for a cluster of lines.
 
     Based on: number of lines, average length, angle consistency.
 
     Args:
-        cluster: List of line dictionaries
+        lines: Detected lines
+        idx: Indices of the cluster members in lines
         img_height: Image height for normalization
         angle_threshold: Maximum angle deviation
 
     Returns:
         float: Quality score 0.0-1.0
     """
-    num_lines = len(cluster)
-    avg_length = sum(l['length'] for l in cluster) / num_lines
-    avg_angle = sum(l['angle'] for l in cluster) / num_lines
+    return _quality_score(
+        idx.size, float(lines.length[idx].mean()), float(lines.angles(idx).mean()),
+        img_height, angle_threshold
+    )
+
+
+def _quality_score(
+    num_lines: int,
+    avg_length: float,
+    avg_angle: float,
+    img_height: int,
+    angle_threshold: float
+) -> float:
+    """
+    Combine line count, length and angle into a quality score 0.0-1.0.
 
+    Args:
+        num_lines: Number of supporting lines
+        avg_length: Average line length in pixels
+        avg_angle: Average degrees from vertical
+        img_height: Image height for normalization
+        angle_threshold: Maximum angle deviation
+
+    Returns:
+        float: Quality score 0.0-1.0
+    """
     # Quality components (0-1 each)
     q_count = min(num_lines / 5, 1.0)  # More lines = more confident
     q_length = min(avg_length / img_height, 1.0)  # Longer lines = more confident
@@ -210,17 +460,25 @@ def _calculate_line_quality(cluster: List[Dict], img_height: int, angle_threshol
 def detect_fold_combined(
     img: np.ndarray,
     side: str = "center",
-    debug: bool = False
+    debug: bool = False,
+    gray: Optional[np.ndarray] = None,
+    fast_mode: bool = False,
+    high_confidence_threshold: float = 0.8
 ) -> Tuple[Optional[int], float, str]:
     """
     Combine brightness-based and Hough-based fold detection.
 
-    Tries both methods and returns the best result based on quality scores.
+    Runs the cheaper brightness detector first and returns it directly when
+    its quality reaches high_confidence_threshold; otherwise tries Hough too
+    and returns the best result based on quality scores.
 
     Args:
         img: Input image
         side: Expected fold location
         debug: Print debug info
+        gray: Precomputed grayscale of img, shared by both detectors (optional)
+        fast_mode: Use the edge column projection shortcut in Hough detection
+        high_confidence_threshold: Brightness quality that skips Hough detection
 
     Returns:
         tuple: (fold_x, quality, method_used)
@@ -229,16 +487,27 @@ def detect_fold_combined(
             - method_used: "brightness", "hough", or "none"
     """
     # Import here to avoid circular dependency
-    from .utils import detect_fold_brightness
+    from .utils import detect_fold_brightness, to_gray
 
     if debug:
         print("\n[Combined] Running both fold detection methods...")
 
+    # Convert once and share between both detectors
+    if gray is None:
+        gray = to_gray(img)
+
     # Try brightness-based detection
-    fold_brightness, quality_brightness = detect_fold_brightness(img, side=side, debug=debug)
+    fold_brightness, quality_brightness = detect_fold_brightness(img, side=side, debug=debug, gray=gray)
+
+    if fold_brightness is not None and quality_brightness >= high_confidence_threshold:
+        if debug:
+            print(f"[Combined] Brightness confident ({quality_brightness:.3f}), skipping Hough")
+        return fold_brightness, quality_brightness, "brightness"
 
     # Try Hough-based detection
-    fold_hough, quality_hough = detect_fold_hough_lines(img, side=side, debug=debug)
+    fold_hough, quality_hough = detect_fold_hough_lines(
+        img, side=side, debug=debug, gray=gray, fast_mode=fast_mode
+    )
 
     # Pick best result
     if fold_brightness is None and fold_hough is None:
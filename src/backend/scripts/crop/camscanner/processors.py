@@ -7,17 +7,82 @@ Three specialized processors:
 3. PartialBookProcessor - Partial books with lateral fold (crop one page)
 """
 
+import logging
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field, fields
+
 import cv2
 import numpy as np
-from typing import Dict, Optional, Tuple
+from typing import Dict, List, Optional, Sequence, Tuple
 
 from .utils import (
     apply_perspective_correction,
+    get_contour_bounds,
     split_at_fold,
     crop_to_fold
 )
 
 
+logger = logging.getLogger(__name__)
+
+
+def _noop(*args, **kwargs):
+    """Stand-in for the debug logger when debug output is off."""
+
+
+def _enable_debug_output():
+    """Print this module's debug records to stdout (installed once).
+
+    The records are not propagated to the root logger, so a host that has
+    configured logging does not print them a second time.
+    """
+    if not logger.handlers:
+        handler = logging.StreamHandler(sys.stdout)
+        handler.setFormatter(logging.Formatter("[Processor] %(message)s"))
+        logger.addHandler(handler)
+        logger.propagate = False
+    logger.setLevel(logging.DEBUG)
+
+
+_IMAGE_FIELDS = frozenset({'processed_image', 'left_image', 'right_image'})
+
+
+@dataclass
+class ProcessingResult:
+    """
+    Output of a processor's process() call (same schema for every processor).
+    """
+    processed_image: np.ndarray
+    success: bool
+    method: str
+    left_image: Optional[np.ndarray] = None
+    right_image: Optional[np.ndarray] = None
+    transform_matrix: Optional[np.ndarray] = None
+    warnings: List[str] = field(default_factory=list)
+    fold_x: Optional[int] = None
+    fold_side: Optional[str] = None
+    kept_side: Optional[str] = None
+    error: Optional[str] = None
+    reason: Optional[str] = None
+
+    def metadata(self) -> Dict:
+        """
+        Non-image fields as a dict.
+
+        Returns:
+            dict: Field name to value, excluding the image arrays
+        """
+        return {name: getattr(self, name) for name in _METADATA_FIELDS}
+
+
+# Fixed by the schema, so resolved once instead of per result
+_METADATA_FIELDS = tuple(
+    f.name for f in fields(ProcessingResult) if f.name not in _IMAGE_FIELDS
+)
+
+
 class DocumentProcessor:
     """
     Base processor with shared configuration and utilities.
@@ -35,11 +100,10 @@ class DocumentProcessor:
         self.fold_border = self.config.get('fold_border', 150)
         self.quality_threshold = self.config.get('quality_threshold', 0.6)
         self.debug = self.config.get('debug', False)
-
-    def _log(self, message: str):
-        """Print debug message if debug enabled."""
+        # Debug messages take %-style args, formatted only when actually emitted
         if self.debug:
-            print(f"[Processor] {message}")
+            _enable_debug_output()
+        self._log = logger.debug if self.debug else _noop
 
 
 class SingleDocumentProcessor(DocumentProcessor):
@@ -57,7 +121,7 @@ class SingleDocumentProcessor(DocumentProcessor):
         img: np.ndarray,
         page_contour: np.ndarray,
         **metadata
-    ) -> Dict:
+    ) -> ProcessingResult:
         """
         Process single flat document.
 
@@ -67,7 +131,7 @@ class SingleDocumentProcessor(DocumentProcessor):
             **metadata: Additional metadata from detector
 
         Returns:
-            dict: Processing result with keys:
+            ProcessingResult with fields:
                 - processed_image: Final processed image
                 - success: True if processing succeeded
                 - method: Processing method used
@@ -82,31 +146,31 @@ class SingleDocumentProcessor(DocumentProcessor):
 
             if warped is None:
                 self._log("Perspective correction failed, returning original")
-                return {
-                    'processed_image': img,
-                    'success': False,
-                    'method': 'fallback_original',
-                    'reason': 'perspective_correction_failed'
-                }
+                return ProcessingResult(
+                    processed_image=img,
+                    success=False,
+                    method='fallback_original',
+                    reason='perspective_correction_failed'
+                )
 
-            self._log(f"Perspective correction applied (border={self.contour_border}px)")
+            self._log("Perspective correction applied (border=%dpx)", self.contour_border)
 
             # Successful processing
-            return {
-                'processed_image': warped,
-                'success': True,
-                'method': 'perspective_correction',
-                'transform_matrix': transform_M
-            }
+            return ProcessingResult(
+                processed_image=warped,
+                success=True,
+                method='perspective_correction',
+                transform_matrix=transform_M
+            )
 
         except Exception as e:
-            self._log(f"Processing failed: {e}")
-            return {
-                'processed_image': img,
-                'success': False,
-                'method': 'fallback_original',
-                'error': str(e)
-            }
+            self._log("Processing failed: %s", e)
+            return ProcessingResult(
+                processed_image=img,
+                success=False,
+                method='fallback_original',
+                error=str(e)
+            )
 
 
 class BookSpreadProcessor(DocumentProcessor):
@@ -128,7 +192,7 @@ class BookSpreadProcessor(DocumentProcessor):
         fold_x: int,
         fold_quality: float,
         **metadata
-    ) -> Dict:
+    ) -> ProcessingResult:
         """
         Process book spread with center fold.
 
@@ -140,7 +204,7 @@ class BookSpreadProcessor(DocumentProcessor):
             **metadata: Additional metadata
 
         Returns:
-            dict: Processing result with keys:
+            ProcessingResult with fields:
                 - left_image: Left page (or None)
                 - right_image: Right page (or None)
                 - processed_image: Full processed image (before split)
@@ -159,71 +223,66 @@ class BookSpreadProcessor(DocumentProcessor):
 
             if warped is None:
                 self._log("Perspective correction failed")
-                return {
-                    'processed_image': img,
-                    'left_image': None,
-                    'right_image': None,
-                    'success': False,
-                    'method': 'fallback_original',
-                    'warnings': warnings,
-                    'reason': 'perspective_correction_failed'
-                }
-
-            self._log(f"Perspective correction applied")
-
-            # Transform fold_x to warped image coordinates
-            h = img.shape[0]
-            fold_line = np.array([[[float(fold_x), 0.0], [float(fold_x), float(h-1)]]], dtype=np.float32)
-            warped_fold_line = cv2.perspectiveTransform(fold_line, transform_M)
-            warped_fold_x = int(np.mean(warped_fold_line[0, :, 0]))
+                return ProcessingResult(
+                    processed_image=img,
+                    success=False,
+                    method='fallback_original',
+                    warnings=warnings,
+                    reason='perspective_correction_failed'
+                )
+
+            self._log("Perspective correction applied")
+
+            # Transform fold_x to warped image coordinates: map the midpoint of
+            # the vertical fold line through the homography (closed form)
+            cy = (img.shape[0] - 1) / 2.0
+            u = transform_M[0, 0] * fold_x + transform_M[0, 1] * cy + transform_M[0, 2]
+            w = transform_M[2, 0] * fold_x + transform_M[2, 1] * cy + transform_M[2, 2]
+            warped_fold_x = int(u / w)
 
             # Check fold quality
             if fold_quality < self.quality_threshold:
-                self._log(f"Fold quality too low ({fold_quality:.3f}), not splitting")
+                self._log("Fold quality too low (%.3f), not splitting", fold_quality)
                 warnings.append(
                     f"Fold detection quality low ({fold_quality:.2f}). "
                     "Image not split into pages."
                 )
-                return {
-                    'processed_image': warped,
-                    'left_image': None,
-                    'right_image': None,
-                    'success': True,
-                    'method': 'no_split_low_quality',
-                    'warnings': warnings
-                }
+                return ProcessingResult(
+                    processed_image=warped,
+                    success=True,
+                    method='no_split_low_quality',
+                    warnings=warnings
+                )
 
             # Split at fold
             left_page, right_page = split_at_fold(
                 warped, warped_fold_x, fold_border=self.fold_border
             )
 
-            self._log(f"Split at fold (x={warped_fold_x}, border={self.fold_border}px)")
-            self._log(f"Left page: {left_page.shape[1]}x{left_page.shape[0]}")
-            self._log(f"Right page: {right_page.shape[1]}x{right_page.shape[0]}")
-
-            return {
-                'processed_image': warped,
-                'left_image': left_page,
-                'right_image': right_page,
-                'success': True,
-                'method': 'split_at_fold',
-                'fold_x': warped_fold_x,
-                'transform_matrix': transform_M,
-                'warnings': warnings
-            }
+            self._log("Split at fold (x=%d, border=%dpx)", warped_fold_x, self.fold_border)
+            self._log("Left page: %dx%d", left_page.shape[1], left_page.shape[0])
+            self._log("Right page: %dx%d", right_page.shape[1], right_page.shape[0])
+
+            return ProcessingResult(
+                processed_image=warped,
+                left_image=left_page,
+                right_image=right_page,
+                success=True,
+                method='split_at_fold',
+                fold_x=warped_fold_x,
+                transform_matrix=transform_M,
+                warnings=warnings
+            )
 
         except Exception as e:
-            self._log(f"Processing failed: {e}")
-            return {
-                'processed_image': img,
-                'left_image': None,
-                'right_image': None,
-                'success': False,
-                'method': 'fallback_original',
-                'warnings': warnings,
-                'error': str(e)
-            }
+            self._log("Processing failed: %s", e)
+            return ProcessingResult(
+                processed_image=img,
+                success=False,
+                method='fallback_original',
+                warnings=warnings,
+                error=str(e)
+            )
 
 
 class PartialBookProcessor(DocumentProcessor):
@@ -244,7 +303,7 @@ class PartialBookProcessor(DocumentProcessor):
         fold_x: int,
         fold_side: str,
         **metadata
-    ) -> Dict:
+    ) -> ProcessingResult:
         """
         Process partial book (one page + lateral fold).
 
@@ -256,68 +315,68 @@ class PartialBookProcessor(DocumentProcessor):
             **metadata: Additional metadata
 
         Returns:
-            dict: Processing result with keys:
+            ProcessingResult with fields:
                 - processed_image: Cropped and corrected page
                 - success: True if processing succeeded
                 - method: Processing method used
                 - fold_side: Which side was cropped
         """
-        self._log(f"Processing partial book (fold on {fold_side} side)")
+        self._log("Processing partial book (fold on %s side)", fold_side)
 
         try:
-            # First apply perspective correction to entire image
-            warped, transform_M = apply_perspective_correction(
-                img, page_contour, border=self.contour_border, debug=self.debug
-            )
-
-            if warped is None:
-                self._log("Perspective correction failed")
-                return {
-                    'processed_image': img,
-                    'success': False,
-                    'method': 'fallback_original',
-                    'reason': 'perspective_correction_failed'
-                }
-
-            self._log("Perspective correction applied")
-
-            # Since warp_image applies rotation/perspective, the fold position changes
-            # For simplicity, just crop based on image dimensions rather than transforming coords
-            # For partial_left (fold on left), keep right 75% of warped image
-            # For partial_right (fold on right), keep left 75% of warped image
-            h, w = warped.shape[:2]
+            # Crop the source to the kept page first (drop the 25% of the page
+            # bounding box on the fold side), so only that region gets warped
+            min_x, _, max_x, _ = get_contour_bounds(page_contour)
+            page_w = max_x - min_x
+            contour = page_contour.copy()
 
             if fold_side == 'left':
                 # Keep right side (main page), remove left fold
-                crop_start = int(w * 0.25)
-                cropped = warped[:, crop_start:]
+                crop_start = min_x + int(page_w * 0.25)
+                region = img[:, crop_start:]
+                contour[..., 0] = np.clip(contour[..., 0], crop_start, None) - crop_start
                 keep_side = 'right'
             else:
                 # Keep left side (main page), remove right fold
-                crop_end = int(w * 0.75)
-                cropped = warped[:, :crop_end]
+                crop_end = min_x + int(page_w * 0.75)
+                region = img[:, :crop_end]
+                contour[..., 0] = np.clip(contour[..., 0], None, crop_end - 1)
                 keep_side = 'left'
 
-            self._log(f"Cropped to {keep_side} side")
-            self._log(f"Result: {cropped.shape[1]}x{cropped.shape[0]}")
+            self._log("Cropped to %s side", keep_side)
+
+            warped, _ = apply_perspective_correction(
+                region, contour, border=self.contour_border, debug=self.debug
+            )
+
+            if warped is None:
+                self._log("Perspective correction failed")
+                return ProcessingResult(
+                    processed_image=img,
+                    success=False,
+                    method='fallback_original',
+                    reason='perspective_correction_failed'
+                )
 
-            return {
-                'processed_image': cropped,
-                'success': True,
-                'method': 'crop_at_fold',
-                'fold_side': fold_side,
-                'kept_side': keep_side,
-                'transform_matrix': transform_M
-            }
+            self._log("Perspective correction applied")
+            self._log("Result: %dx%d", warped.shape[1], warped.shape[0])
+
+            return ProcessingResult(
+                processed_image=warped,
+                success=True,
+                method='crop_at_fold',
+                fold_side=fold_side,
+                kept_side=keep_side
+            )
 
         except Exception as e:
-            self._log(f"Processing failed: {e}")
-            return {
-                'processed_image': img,
-                'success': False,
-                'method': 'fallback_original',
-                'error': str(e)
-            }
+            self._log("Processing failed: %s", e)
+            return ProcessingResult(
+                processed_image=img,
+                success=False,
+                method='fallback_original',
+                error=str(e)
+            )
 
 
 def create_processor(document_type: str, config: Optional[Dict] = None) -> Optional[DocumentProcessor]:
@@ -345,6 +404,47 @@ def create_processor(document_type: str, config: Optional[Dict] = None) -> Optio
     return processor_class(config)
 
 
+def process_batch(
+    imgs: Sequence[np.ndarray],
+    document_types: Sequence[str],
+    metadatas: Sequence[Dict],
+    config: Optional[Dict] = None,
+    num_workers: Optional[int] = None
+) -> List[Optional[ProcessingResult]]:
+    """
+    Process several already-loaded pages concurrently.
+
+    Uses threads rather than processes: the heavy OpenCV calls release the
+    GIL, and the page arrays are shared instead of pickled to workers.
+
+    Args:
+        imgs: Input images
+        document_types: Detected document type of each image
+        metadatas: Detection metadata of each image (processor kwargs)
+        config: Optional configuration dict
+        num_workers: Number of worker threads (None = CPU count)
+
+    Returns:
+        List of processing results, same order as imgs
+        (None where no processor exists for the document type)
+    """
+    # Processors keep no per-call state, so one instance per type is shared
+    processors = {
+        doc_type: create_processor(doc_type, config)
+        for doc_type in set(document_types)
+    }
+
+    def run(args):
+        img, doc_type, metadata = args
+        processor = processors[doc_type]
+        if processor is None:
+            return None
+        return processor.process(img, **metadata)
+
+    with ThreadPoolExecutor(max_workers=num_workers or os.cpu_count()) as pool:
+        return list(pool.map(run, zip(imgs, document_types, metadatas)))
+
+
 if __name__ == "__main__":
     """Test processors on sample image."""
     import sys
@@ -381,24 +481,24 @@ if __name__ == "__main__":
     print(f"\n=== Processing with {processor.__class__.__name__} ===")
     result = processor.process(img, **metadata)
 
-    print(f"\nSuccess: {result['success']}")
-    print(f"Method: {result['method']}")
+    print(f"\nSuccess: {result.success}")
+    print(f"Method: {result.method}")
 
-    if result['success']:
+    if result.success:
         # Save results
-        if 'left_image' in result and result['left_image'] is not None:
-            cv2.imwrite("output_left.jpg", result['left_image'])
+        if result.left_image is not None:
+            cv2.imwrite("output_left.jpg", result.left_image)
             print("Saved: output_left.jpg")
 
-        if 'right_image' in result and result['right_image'] is not None:
-            cv2.imwrite("output_right.jpg", result['right_image'])
+        if result.right_image is not None:
+            cv2.imwrite("output_right.jpg", result.right_image)
             print("Saved: output_right.jpg")
 
-        if 'processed_image' in result:
-            cv2.imwrite("output_processed.jpg", result['processed_image'])
+        if result.processed_image is not None:
+            cv2.imwrite("output_processed.jpg", result.processed_image)
             print("Saved: output_processed.jpg")
 
-    if 'warnings' in result and result['warnings']:
+    if result.warnings:
         print("\nWarnings:")
-        for warning in result['warnings']:
+        for warning in result.warnings:
             print(f"  - {warning}")
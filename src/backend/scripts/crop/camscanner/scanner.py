@@ -8,12 +8,99 @@ Simple API for automatic document scanning:
 
 import numpy as np
 import cv2
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
-from typing import Union, Optional, Dict, List
+from typing import Union, Optional, Dict, List, Tuple
 
-from .utils import load_image
+from .utils import load_image, configure_opencv_threads
 from .detectors import DocumentTypeDetector
-from .processors import create_processor
+from .processors import create_processor, ProcessingResult
+
+try:
+    import simplejpeg
+except ImportError:
+    simplejpeg = None
+
+
+# cv2.imread flags that decode directly at 1/2, 1/4 or 1/8 resolution
+_REDUCED_READ_FLAGS = {
+    2: cv2.IMREAD_REDUCED_COLOR_2,
+    4: cv2.IMREAD_REDUCED_COLOR_4,
+    8: cv2.IMREAD_REDUCED_COLOR_8,
+}
+
+_JPEG_SUFFIXES = {'.jpg', '.jpeg'}
+
+# Encodes left/right pages of a spread concurrently (encoders release the GIL)
+_SAVE_POOL = ThreadPoolExecutor(max_workers=2)
+
+
+def _write_image(path: Path, img: np.ndarray, quality: int):
+    """
+    Write image to disk, encoding JPEGs with libjpeg-turbo when available.
+
+    Args:
+        path: Output file path
+        img: BGR or grayscale image
+        quality: JPEG quality (0-100)
+    """
+    if (
+        simplejpeg is not None
+        and path.suffix.lower() in _JPEG_SUFFIXES
+        and img.dtype == np.uint8
+        and img.ndim == 3 and img.shape[2] == 3
+    ):
+        data = simplejpeg.encode_jpeg(
+            np.ascontiguousarray(img), quality=quality, colorspace='BGR'
+        )
+        with open(path, 'wb') as f:
+            f.write(data)
+        return
+
+    cv2.imwrite(str(path), img, [cv2.IMWRITE_JPEG_QUALITY, quality])
+
+
+def _imshow_view(img: np.ndarray) -> Tuple[np.ndarray, Optional[str]]:
+    """
+    RGB view of a BGR(A) or grayscale image for matplotlib, without copying.
+
+    imshow reads the reversed-channel view through its strides, so the
+    conversion happens while it renders instead of as a separate pass.
+
+    Args:
+        img: BGR, BGRA or grayscale image
+
+    Returns:
+        tuple: (image view, colormap for imshow)
+    """
+    if img.ndim == 2:
+        return img, 'gray'
+    # Channels 2, 1, 0: RGB for both BGR and BGRA (alpha is not displayed)
+    return img[..., 2::-1], None
+
+
+@lru_cache(maxsize=16)
+def _cached_detector(config_items: tuple) -> DocumentTypeDetector:
+    """Detector shared by every scanner built with the same config."""
+    return DocumentTypeDetector(dict(config_items))
+
+
+def _make_detector(config: Dict) -> DocumentTypeDetector:
+    """
+    Get a detector for config, reusing one already built for equal settings.
+
+    Args:
+        config: Scanner configuration
+
+    Returns:
+        DocumentTypeDetector instance
+    """
+    try:
+        return _cached_detector(tuple(sorted(config.items())))
+    except TypeError:
+        # Unhashable option values: build a private detector
+        return DocumentTypeDetector(config)
 
 
 class ScanResult:
@@ -21,6 +108,11 @@ class ScanResult:
     Container for scan results with processed images and metadata.
     """
 
+    __slots__ = (
+        'processed_image', 'left_image', 'right_image', 'document_type',
+        'confidence', 'warnings', 'debug_info', 'success'
+    )
+
     def __init__(
         self,
         processed_image: Optional[np.ndarray] = None,
@@ -80,21 +172,30 @@ class ScanResult:
 
             output_dir.mkdir(parents=True, exist_ok=True)
 
-            if self.left_image is not None:
+            if self.left_image is not None and self.right_image is not None:
+                futures = [
+                    _SAVE_POOL.submit(
+                        _write_image, output_dir / f"{base_name}_left{ext}", self.left_image, quality
+                    ),
+                    _SAVE_POOL.submit(
+                        _write_image, output_dir / f"{base_name}_right{ext}", self.right_image, quality
+                    ),
+                ]
+                for future in futures:
+                    future.result()
+
+            elif self.left_image is not None:
                 left_path = output_dir / f"{base_name}_left{ext}"
-                cv2.imwrite(str(left_path), self.left_image,
-                           [cv2.IMWRITE_JPEG_QUALITY, quality])
+                _write_image(left_path, self.left_image, quality)
 
-            if self.right_image is not None:
+            else:
                 right_path = output_dir / f"{base_name}_right{ext}"
-                cv2.imwrite(str(right_path), self.right_image,
-                           [cv2.IMWRITE_JPEG_QUALITY, quality])
+                _write_image(right_path, self.right_image, quality)
 
         # For single processed image
         elif self.processed_image is not None:
             output_path.parent.mkdir(parents=True, exist_ok=True)
-            cv2.imwrite(str(output_path), self.processed_image,
-                       [cv2.IMWRITE_JPEG_QUALITY, quality])
+            _write_image(output_path, self.processed_image, quality)
 
     def show(self, title: str = "Scan Result"):
         """
@@ -113,16 +214,19 @@ class ScanResult:
         if self.left_image is not None and self.right_image is not None:
             # Show both pages
             fig, axes = plt.subplots(1, 2, figsize=(12, 6))
-            axes[0].imshow(cv2.cvtColor(self.left_image, cv2.COLOR_BGR2RGB))
-            axes[0].set_title("Left Page")
-            axes[0].axis('off')
-            axes[1].imshow(cv2.cvtColor(self.right_image, cv2.COLOR_BGR2RGB))
-            axes[1].set_title("Right Page")
-            axes[1].axis('off')
+            for ax, page, page_title in (
+                (axes[0], self.left_image, "Left Page"),
+                (axes[1], self.right_image, "Right Page")
+            ):
+                view, cmap = _imshow_view(page)
+                ax.imshow(view, cmap=cmap)
+                ax.set_title(page_title)
+                ax.axis('off')
         elif self.processed_image is not None:
             # Show single image
             plt.figure(figsize=(8, 10))
-            plt.imshow(cv2.cvtColor(self.processed_image, cv2.COLOR_BGR2RGB))
+            view, cmap = _imshow_view(self.processed_image)
+            plt.imshow(view, cmap=cmap)
             plt.title(title)
             plt.axis('off')
 
@@ -176,8 +280,18 @@ class CamScanner:
             **config
         }
 
+        # Optional reduced-resolution decode for the detection stage (1 = off)
+        self.detect_reduced_factor = self.config.get('detect_reduced_factor', 1)
+        if self.detect_reduced_factor not in (1, *_REDUCED_READ_FLAGS):
+            raise ValueError(
+                f"detect_reduced_factor must be 1, 2, 4 or 8, got {self.detect_reduced_factor}"
+            )
+
+        # Inputs are already cropped pages: skip detection and processing
+        self.assume_flat = self.config.get('assume_flat', False)
+
         # Initialize detector
-        self.detector = DocumentTypeDetector(self.config)
+        self.detector = _make_detector(self.config)
 
         if self.debug:
             print(f"[CamScanner] Initialized with config: {self.config}")
@@ -192,47 +306,165 @@ class CamScanner:
         Returns:
             ScanResult object with processed image(s) and metadata
         """
+        detect_img = None
         try:
+            # Let libjpeg skip DCT coefficients for the detection image
+            if (self.detect_reduced_factor > 1 and not self.assume_flat
+                    and isinstance(image, (str, Path))):
+                detect_img = cv2.imread(str(image), _REDUCED_READ_FLAGS[self.detect_reduced_factor])
+
             # Load and normalize input
             img = load_image(image)
+        except Exception as e:
+            if self.debug:
+                import traceback
+                traceback.print_exc()
+            return self._create_error_result(str(e))
+
+        return self.scan_array(img, detect_img=detect_img)
+
+    def scan_array(
+        self,
+        img: np.ndarray,
+        detect_img: Optional[np.ndarray] = None
+    ) -> ScanResult:
+        """
+        Process an already decoded BGR image.
+
+        Unlike scan(), the array is used as-is (no loading, no defensive
+        copy), so it must not be modified while the scan runs.
+
+        Args:
+            img: BGR image
+            detect_img: Optional reduced-resolution decode of img used for
+                detection only
 
+        Returns:
+            ScanResult object with processed image(s) and metadata
+        """
+        if self.assume_flat:
+            return self._create_passthrough_result(img)
+
+        try:
             if self.debug:
                 h, w = img.shape[:2]
                 print(f"\n[CamScanner] Processing image: {w}x{h}")
 
             # Detect document type
-            doc_type, confidence, metadata = self.detector.detect(img)
+            doc_type, confidence, metadata = self.detector.detect(img, detect_img=detect_img)
 
+            return self._process(img, doc_type, confidence, metadata)
+
+        except Exception as e:
             if self.debug:
-                print(f"[CamScanner] Detected: {doc_type} (confidence={confidence:.3f})")
+                import traceback
+                traceback.print_exc()
+            return self._create_error_result(str(e), img)
 
-            # Handle unknown/failed detection
-            if doc_type == "unknown":
-                return self._create_fallback_result(img, metadata)
+    def scan_batch(
+        self,
+        images: List[Union[str, Path, np.ndarray]],
+        io_workers: int = 4
+    ) -> List[ScanResult]:
+        """
+        Process several images, classifying them in one vectorized pass.
 
-            # Create appropriate processor
-            processor = create_processor(doc_type, self.config)
-            if processor is None:
-                return self._create_fallback_result(
-                    img, metadata, reason=f"No processor for type '{doc_type}'"
-                )
+        Images are decoded by a small pool of reader threads (OpenCV releases
+        the GIL while decoding), so disk reads overlap with detection of the
+        images already loaded.
 
-            # Process image
-            result = processor.process(img, **metadata)
+        Args:
+            images: File paths, numpy arrays, or PIL Images
+            io_workers: Number of reader threads
 
-            # Package result
-            return self._create_result(img, result, doc_type, confidence, metadata)
+        Returns:
+            List of ScanResult objects, same order as images
+        """
+        if self.assume_flat:
+            return [self.scan(image) for image in images]
+
+        results: List[Optional[ScanResult]] = [None] * len(images)
+        loaded = []
+
+        with ThreadPoolExecutor(max_workers=io_workers) as io:
+            futures = [io.submit(load_image, image) for image in images]
+
+            def prefetched():
+                for i, future in enumerate(futures):
+                    try:
+                        img = future.result()
+                    except Exception as e:
+                        results[i] = self._create_error_result(str(e))
+                        continue
+                    loaded.append((i, img))
+                    yield img
+
+            try:
+                detections = self.detector.detect_batch(prefetched())
+            except Exception:
+                if self.debug:
+                    import traceback
+                    traceback.print_exc()
+                # One bad image must not fail the whole batch: retry individually
+                for i, result in enumerate(results):
+                    if result is None:
+                        results[i] = self.scan(images[i])
+                return results
+
+        for (i, img), (doc_type, confidence, metadata) in zip(loaded, detections):
+            try:
+                results[i] = self._process(img, doc_type, confidence, metadata)
+            except Exception as e:
+                if self.debug:
+                    import traceback
+                    traceback.print_exc()
+                results[i] = self._create_error_result(str(e), img)
+
+        return results
+
+    def _process(
+        self,
+        img: np.ndarray,
+        doc_type: str,
+        confidence: float,
+        metadata: Dict
+    ) -> ScanResult:
+        """
+        Run the processor matching the detected document type.
 
-        except Exception as e:
-            if self.debug:
-                import traceback
-                traceback.print_exc()
-            return self._create_error_result(image, str(e))
+        Args:
+            img: Input image
+            doc_type: Detected document type
+            confidence: Detection confidence
+            metadata: Detection metadata
+
+        Returns:
+            ScanResult object
+        """
+        if self.debug:
+            print(f"[CamScanner] Detected: {doc_type} (confidence={confidence:.3f})")
+
+        # Handle unknown/failed detection
+        if doc_type == "unknown":
+            return self._create_fallback_result(img, metadata)
+
+        # Create appropriate processor
+        processor = create_processor(doc_type, self.config)
+        if processor is None:
+            return self._create_fallback_result(
+                img, metadata, reason=f"No processor for type '{doc_type}'"
+            )
+
+        # Process image
+        result = processor.process(img, **metadata)
+
+        # Package result
+        return self._create_result(img, result, doc_type, confidence, metadata)
 
     def _create_result(
         self,
         original: np.ndarray,
-        processing_result: Dict,
+        processing_result: ProcessingResult,
         doc_type: str,
         confidence: float,
         metadata: Dict
@@ -251,33 +483,41 @@ class CamScanner:
             ScanResult object
         """
         # Extract warnings from both metadata and processing result
-        warnings = []
-        warnings.extend(metadata.get('warnings', []))
-        warnings.extend(processing_result.get('warnings', []))
+        warnings = [*metadata.get('warnings', ()), *processing_result.warnings]
 
         # Build debug info
         debug_info = {
             'document_type': doc_type,
             'detection_confidence': confidence,
-            'processing_method': processing_result.get('method'),
+            'processing_method': processing_result.method,
             'detection_metadata': metadata,
-            'processing_metadata': {
-                k: v for k, v in processing_result.items()
-                if k not in ['processed_image', 'left_image', 'right_image']
-            }
+            'processing_metadata': processing_result.metadata()
         }
 
         return ScanResult(
-            processed_image=processing_result.get('processed_image'),
-            left_image=processing_result.get('left_image'),
-            right_image=processing_result.get('right_image'),
+            processed_image=processing_result.processed_image,
+            left_image=processing_result.left_image,
+            right_image=processing_result.right_image,
             document_type=doc_type,
             confidence=confidence,
             warnings=warnings,
             debug_info=debug_info,
-            success=processing_result.get('success', False)
+            success=processing_result.success
         )
 
+    def _create_passthrough_result(self, img: np.ndarray) -> ScanResult:
+        """
+        Wrap an already cropped page as a single-document result (assume_flat).
+
+        Args:
+            img: Input image, returned unchanged
+
+        Returns:
+            ScanResult with the input image
+        """
+        result = ProcessingResult(processed_image=img, success=True, method='passthrough')
+        return self._create_result(img, result, 'single', 1.0, {})
+
     def _create_fallback_result(
         self,
         img: np.ndarray,
@@ -311,23 +551,21 @@ class CamScanner:
             success=False
         )
 
-    def _create_error_result(self, image_input, error_msg: str) -> ScanResult:
+    def _create_error_result(
+        self,
+        error_msg: str,
+        img: Optional[np.ndarray] = None
+    ) -> ScanResult:
         """
         Create error result.
 
         Args:
-            image_input: Original image input
             error_msg: Error message
+            img: Already decoded input image, if loading got that far
 
         Returns:
             ScanResult with error information
         """
-        # Try to load image for fallback
-        try:
-            img = load_image(image_input)
-        except:
-            img = None
-
         return ScanResult(
             processed_image=img,
             document_type="unknown",
@@ -359,6 +597,9 @@ if __name__ == "__main__":
     print(f"Debug: {debug}")
     print()
 
+    # Single process: let OpenCV parallelize each pass over all cores
+    configure_opencv_threads()
+
     # Create scanner
     scanner = CamScanner(debug=debug)
 
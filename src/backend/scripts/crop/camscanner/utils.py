@@ -7,7 +7,7 @@ Provides clean interface to contour detection, fold detection, and image I/O.
 import sys
 import os
 from pathlib import Path
-from typing import Union, Tuple, Optional
+from typing import List, NamedTuple, Union, Tuple, Optional
 
 import cv2
 import numpy as np
@@ -26,6 +26,25 @@ from src.fold_detection import detect_fold_brightness_profile
 from src.image_io import load_image as _load_image_original
 
 
+def configure_opencv_threads(num_threads: Optional[int] = None):
+    """
+    Set OpenCV's internal thread count; call once from the program entry point.
+
+    The heavy passes (cvtColor, Canny, Hough voting, warpAffine, resize) do a
+    few operations per pixel but stream each multi-megapixel page through
+    memory several times, so they are memory-bandwidth bound rather than
+    compute bound. One process scanning one page at a time benefits from
+    OpenCV's own row-parallel loops on every core; a pool of worker
+    processes should use 1 thread each, otherwise N processes x N OpenCV
+    threads oversubscribe the cores and fight over the same bandwidth.
+
+    Args:
+        num_threads: Threads for OpenCV (None = CPU count)
+    """
+    cv2.setUseOptimized(True)
+    cv2.setNumThreads(num_threads or os.cpu_count())
+
+
 def load_image(image_input: Union[str, Path, np.ndarray, Image.Image]) -> np.ndarray:
     """
     Load and normalize image from various input types.
@@ -34,27 +53,53 @@ def load_image(image_input: Union[str, Path, np.ndarray, Image.Image]) -> np.nda
         image_input: File path, numpy array, or PIL Image
 
     Returns:
-        np.ndarray: BGR image (OpenCV format)
+        np.ndarray: BGR image (OpenCV format). Numpy input is returned as is,
+        not copied: the pipeline only reads it, callers that mutate copy first.
     """
     if isinstance(image_input, (str, Path)):
         # Load from file path
         return _load_image_original(str(image_input))
     elif isinstance(image_input, np.ndarray):
         # Already numpy array
-        return image_input.copy()
+        return image_input
     elif isinstance(image_input, Image.Image):
-        # Convert PIL to OpenCV
-        img_array = np.array(image_input)
-        # Convert RGB to BGR if needed
-        if len(img_array.shape) == 3 and img_array.shape[2] == 3:
-            return cv2.cvtColor(img_array, cv2.COLOR_RGB2BGR)
-        return img_array
+        # Convert PIL to OpenCV. This is memory bound (no arithmetic), so the
+        # goal is a single pass over the pixels: wrap PIL's packed buffer
+        # without another conversion, then reorder channels in one copy
+        if image_input.mode in ('RGB', 'RGBA'):
+            w, h = image_input.size
+            img_array = np.frombuffer(image_input.tobytes(), np.uint8).reshape(
+                h, w, len(image_input.mode)
+            )
+            # RGB(A) to BGR(A)
+            if img_array.shape[2] == 3:
+                return np.ascontiguousarray(img_array[..., ::-1])
+            return np.ascontiguousarray(img_array[..., [2, 1, 0, 3]])
+        # Other modes (L, I;16, ...): writable copy like the other outputs
+        return np.array(image_input)
     else:
         raise TypeError(f"Unsupported image input type: {type(image_input)}")
 
 
+def to_gray(img: np.ndarray) -> np.ndarray:
+    """
+    Convert image to single-channel grayscale.
+
+    Args:
+        img: Grayscale, BGR or BGRA image
+
+    Returns:
+        np.ndarray: Grayscale image (the input itself if already single-channel)
+    """
+    if img.ndim == 2:
+        return img
+    if img.shape[2] == 4:
+        return cv2.cvtColor(img, cv2.COLOR_BGRA2GRAY)
+    return cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
+
+
 def detect_page_boundary(
-    img: np.ndarray, debug: bool = False
+    img: np.ndarray, debug: bool = False, gray: Optional[np.ndarray] = None
 ) -> Tuple[Optional[np.ndarray], Optional[float]]:
     """
     Detect document page boundary (4 corners).
@@ -62,6 +107,7 @@ def detect_page_boundary(
     Args:
         img: Input image
         debug: Enable debug output
+        gray: Precomputed grayscale of img (optional, skips conversion)
 
     Returns:
         tuple: (contour, angle) or (None, None) if not found
@@ -70,7 +116,7 @@ def detect_page_boundary(
     """
     try:
         # Preprocess image
-        thresh, border_rgb = preprocess_image(img)
+        thresh, border_rgb = preprocess_image(img, gray=gray)
 
         # Find page contour
         contour, angle = find_page_contour(
@@ -105,15 +151,21 @@ def apply_perspective_correction(
 
     Returns:
         tuple: (warped_image, transform_matrix) or (None, None)
+            - transform_matrix: 3x3 matrix mapping original image
+              coordinates to warped image coordinates
     """
     try:
-        warped, crop_no_rotation, transform_M = warp_image(
-            img, contour, border_pixels=border, scale_factor=1.0
+        warped, crop_no_rotation, M, (crop_x, crop_y) = warp_image(
+            img, contour, border_pixels=border, scale_factor=1.0, return_offset=True
         )
-        # warp_image returns rotation matrix M, not perspective transform matrix
-        # For fold coordinate transformation, we can't use this directly
-        # Return None as transform matrix (will handle fold coords differently)
-        return warped, None
+        # warp_image rotates with the 2x3 matrix M and then crops at (crop_x, crop_y):
+        # compose both into a single homogeneous transform
+        transform_M = np.array([
+            [M[0, 0], M[0, 1], M[0, 2] - crop_x],
+            [M[1, 0], M[1, 1], M[1, 2] - crop_y],
+            [0.0, 0.0, 1.0]
+        ], dtype=np.float64)
+        return warped, transform_M
     except Exception as e:
         if debug:
             print(f"[Utils] Perspective correction failed: {e}")
@@ -121,7 +173,8 @@ def apply_perspective_correction(
 
 
 def detect_fold_brightness(
-    img: np.ndarray, side: str = "center", debug: bool = False
+    img: np.ndarray, side: str = "center", debug: bool = False,
+    gray: Optional[np.ndarray] = None
 ) -> Tuple[Optional[int], float]:
     """
     Detect fold using brightness profile analysis.
@@ -130,13 +183,14 @@ def detect_fold_brightness(
         img: Input image
         side: Expected fold location ('left', 'right', 'center')
         debug: Enable debug output
+        gray: Precomputed grayscale of img (optional, skips conversion)
 
     Returns:
         tuple: (fold_x_position, quality_score)
     """
     try:
         fold_x, angle, slope, intercept, quality = detect_fold_brightness_profile(
-            img, side=side, debug=debug
+            img, side=side, debug=debug, gray=gray
         )
         return fold_x, quality
     except Exception as e:
@@ -145,22 +199,70 @@ def detect_fold_brightness(
         return None, 0.0
 
 
-def calculate_aspect_ratio(contour: np.ndarray) -> float:
+def _polygon_area(points: List[List[float]]) -> float:
+    """
+    Shoelace area of a small polygon given as a list of [x, y] points.
+
+    Same value as cv2.contourArea for simple polygons, without the OpenCV
+    call overhead that dominates for a 4-point contour.
+    """
+    n = len(points)
+    twice_area = 0.0
+    for i in range(n):
+        x0, y0 = points[i]
+        x1, y1 = points[(i + 1) % n]
+        twice_area += x0 * y1 - x1 * y0
+    return abs(twice_area) * 0.5
+
+
+class ContourStats(NamedTuple):
+    """Bounds, mean x and area of a page contour, computed once and shared."""
+    min_x: int
+    min_y: int
+    max_x: int
+    max_y: int
+    mean_x: float
+    area: float
+
+
+def contour_stats(contour: np.ndarray) -> ContourStats:
+    """
+    Compute the geometry used by the contour helpers in one pass.
+
+    Page contours have 4 points, where plain Python min/max on a list is
+    cheaper than dispatching several NumPy reductions.
+
+    Args:
+        contour: 4-point contour
+
+    Returns:
+        ContourStats: Bounds, mean x and area of the contour
+    """
+    points = contour.reshape(-1, 2).tolist()
+    xs = [p[0] for p in points]
+    ys = [p[1] for p in points]
+    return ContourStats(
+        int(min(xs)), int(min(ys)), int(max(xs)), int(max(ys)),
+        sum(xs) / len(xs),
+        _polygon_area(points)
+    )
+
+
+def calculate_aspect_ratio(contour: np.ndarray, stats: Optional[ContourStats] = None) -> float:
     """
     Calculate aspect ratio of contour bounding box.
 
     Args:
         contour: 4-point contour
+        stats: Precomputed contour_stats (optional)
 
     Returns:
         float: aspect ratio (width / height)
     """
-    points = contour.reshape(-1, 2)
-    x_coords = points[:, 0]
-    y_coords = points[:, 1]
+    min_x, min_y, max_x, max_y = get_contour_bounds(contour, stats)
 
-    width = np.max(x_coords) - np.min(x_coords)
-    height = np.max(y_coords) - np.min(y_coords)
+    width = max_x - min_x
+    height = max_y - min_y
 
     if height == 0:
         return 0.0
@@ -168,60 +270,71 @@ def calculate_aspect_ratio(contour: np.ndarray) -> float:
     return width / height
 
 
-def get_contour_bounds(contour: np.ndarray) -> Tuple[int, int, int, int]:
+def get_contour_bounds(
+    contour: np.ndarray, stats: Optional[ContourStats] = None
+) -> Tuple[int, int, int, int]:
     """
     Get bounding box of contour.
 
     Args:
         contour: 4-point contour
+        stats: Precomputed contour_stats (optional)
 
     Returns:
         tuple: (min_x, min_y, max_x, max_y)
     """
-    points = contour.reshape(-1, 2)
-    min_x = int(np.min(points[:, 0]))
-    max_x = int(np.max(points[:, 0]))
-    min_y = int(np.min(points[:, 1]))
-    max_y = int(np.max(points[:, 1]))
+    if stats is not None:
+        return stats.min_x, stats.min_y, stats.max_x, stats.max_y
 
-    return min_x, min_y, max_x, max_y
+    points = contour.reshape(-1, 2).tolist()
+    xs = [p[0] for p in points]
+    ys = [p[1] for p in points]
 
+    return int(min(xs)), int(min(ys)), int(max(xs)), int(max(ys))
 
-def get_page_center_x(contour: np.ndarray) -> int:
+
+def get_page_center_x(contour: np.ndarray, stats: Optional[ContourStats] = None) -> int:
     """
     Get center X coordinate of page contour.
 
     Args:
         contour: 4-point contour
+        stats: Precomputed contour_stats (optional)
 
     Returns:
         int: Center X coordinate
     """
+    if stats is not None:
+        return int(stats.mean_x)
     points = contour.reshape(-1, 2)
     return int(np.mean(points[:, 0]))
 
 
-def get_page_width(contour: np.ndarray) -> int:
+def get_page_width(contour: np.ndarray, stats: Optional[ContourStats] = None) -> int:
     """
     Get width of page contour.
 
     Args:
         contour: 4-point contour
+        stats: Precomputed contour_stats (optional)
 
     Returns:
         int: Width in pixels
     """
-    points = contour.reshape(-1, 2)
-    return int(np.max(points[:, 0]) - np.min(points[:, 0]))
+    min_x, _, max_x, _ = get_contour_bounds(contour, stats)
+    return max_x - min_x
 
 
-def is_valid_contour(contour: np.ndarray, img_shape: tuple) -> bool:
+def is_valid_contour(
+    contour: np.ndarray, img_shape: tuple, stats: Optional[ContourStats] = None
+) -> bool:
     """
     Check if contour is valid (not too small or too large).
 
     Args:
         contour: 4-point contour
         img_shape: Image shape (height, width, channels)
+        stats: Precomputed contour_stats (optional, reuses its area)
 
     Returns:
         bool: True if valid
@@ -233,7 +346,10 @@ def is_valid_contour(contour: np.ndarray, img_shape: tuple) -> bool:
     img_area = h * w
 
     # Calculate contour area
-    contour_area = cv2.contourArea(contour)
+    if stats is not None:
+        contour_area = stats.area
+    else:
+        contour_area = _polygon_area(contour.reshape(-1, 2).tolist())
 
     # Should cover at least 10% of image but not more than 98%
     min_area = img_area * 0.10
@@ -242,14 +358,22 @@ def is_valid_contour(contour: np.ndarray, img_shape: tuple) -> bool:
     return min_area <= contour_area <= max_area
 
 
-def page_covers_full_image(contour: np.ndarray, img_shape: tuple, threshold: float = 0.9) -> bool:
+def page_covers_full_image(
+    contour: np.ndarray, img_shape: tuple, threshold: float = 0.9,
+    stats: Optional[ContourStats] = None
+) -> bool:
     """
     Check if page contour covers most of the image.
 
+    Uses the contour's bounding-box area, a constant-time approximation that
+    is accurate for the near-rectangular quads produced by page boundary
+    detection (it slightly overestimates coverage for skewed pages).
+
     Args:
         contour: 4-point contour
         img_shape: Image shape
         threshold: Coverage threshold (0.0-1.0)
+        stats: Precomputed contour_stats (optional)
 
     Returns:
         bool: True if page covers >= threshold of image
@@ -258,25 +382,27 @@ def page_covers_full_image(contour: np.ndarray, img_shape: tuple, threshold: flo
         return False
 
     h, w = img_shape[:2]
-    img_area = h * w
-    contour_area = cv2.contourArea(contour)
+    min_x, min_y, max_x, max_y = get_contour_bounds(contour, stats)
+    bbox_area = (max_x - min_x) * (max_y - min_y)
 
-    coverage = contour_area / img_area
-    return coverage >= threshold
+    return bbox_area / (h * w) >= threshold
 
 
-def calculate_fold_position_ratio(fold_x: int, contour: np.ndarray) -> float:
+def calculate_fold_position_ratio(
+    fold_x: int, contour: np.ndarray, stats: Optional[ContourStats] = None
+) -> float:
     """
     Calculate fold position as ratio within page boundaries.
 
     Args:
         fold_x: Fold X coordinate
         contour: Page contour
+        stats: Precomputed contour_stats (optional)
 
     Returns:
         float: Position ratio 0.0-1.0 (0=left edge, 0.5=center, 1.0=right edge)
     """
-    min_x, _, max_x, _ = get_contour_bounds(contour)
+    min_x, _, max_x, _ = get_contour_bounds(contour, stats)
     page_width = max_x - min_x
 
     if page_width == 0:
@@ -289,16 +415,96 @@ def calculate_fold_position_ratio(fold_x: int, contour: np.ndarray) -> float:
     return max(0.0, min(1.0, position))
 
 
+def contour_metrics(fold_x: int, contour: np.ndarray) -> Tuple[float, int, int]:
+    """
+    Compute fold ratio, page width and page center in a single pass.
+
+    Equivalent to calling calculate_fold_position_ratio, get_page_width and
+    get_page_center_x, but reshapes the contour and reduces its x coordinates
+    only once.
+
+    Args:
+        fold_x: Fold X coordinate
+        contour: Page contour
+
+    Returns:
+        tuple: (fold_ratio, page_width, page_center_x)
+    """
+    xs = contour.reshape(-1, 2)[:, 0]
+    min_x = int(xs.min())
+    max_x = int(xs.max())
+    page_width = max_x - min_x
+    page_center_x = int(xs.mean())
+
+    if page_width == 0:
+        return 0.5, page_width, page_center_x
+
+    position = (fold_x - min_x) / page_width
+    return max(0.0, min(1.0, position)), page_width, page_center_x
+
+
+def batch_contour_metrics(
+    contours: np.ndarray,
+    img_shapes: np.ndarray,
+    fold_xs: np.ndarray,
+    coverage_threshold: float = 0.85
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Vectorized coverage check and fold geometry for a batch of pages.
+
+    Batched equivalent of page_covers_full_image and contour_metrics,
+    computed with a handful of NumPy reductions instead of per-image Python
+    calls. Contour validity is not checked here (is_valid_contour already
+    runs during feature extraction).
+
+    Args:
+        contours: Page contours, shape (N, 4, 2)
+        img_shapes: Image (height, width) pairs, shape (N, 2)
+        fold_xs: Fold X coordinates, shape (N,) (NaN where no fold)
+        coverage_threshold: Coverage threshold (0.0-1.0)
+
+    Returns:
+        tuple: (coverage_mask, fold_ratios, page_widths, page_centers_x)
+    """
+    contours = np.asarray(contours, dtype=np.float64)
+    img_shapes = np.asarray(img_shapes, dtype=np.float64)
+    fold_xs = np.asarray(fold_xs, dtype=np.float64)
+
+    xs = contours[:, :, 0]
+    ys = contours[:, :, 1]
+
+    img_areas = img_shapes[:, 0] * img_shapes[:, 1]
+
+    min_x = np.floor(xs.min(axis=1))
+    max_x = np.floor(xs.max(axis=1))
+    bbox_areas = (max_x - min_x) * (np.floor(ys.max(axis=1)) - np.floor(ys.min(axis=1)))
+    coverage_mask = bbox_areas / img_areas >= coverage_threshold
+    page_widths = (max_x - min_x).astype(np.int64)
+    page_centers_x = xs.mean(axis=1).astype(np.int64)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        fold_ratios = np.clip((fold_xs - min_x) / page_widths, 0.0, 1.0)
+    fold_ratios[page_widths == 0] = 0.5
+
+    return coverage_mask, fold_ratios, page_widths, page_centers_x
+
+
 def split_at_fold(
-    img: np.ndarray, fold_x: int, fold_border: int = 50
+    img: np.ndarray, fold_x: int, fold_border: int = 50,
+    contiguous: bool = False
 ) -> Tuple[np.ndarray, np.ndarray]:
     """
     Split image at fold line into left and right parts.
 
+    The parts are column views of img by default. OpenCV reads them through
+    the row step, so encoding them directly needs no copy; pass
+    contiguous=True when several further operations will run on the pages.
+
     Args:
         img: Input image
         fold_x: Fold X coordinate
         fold_border: Border pixels around fold
+        contiguous: Return compact copies instead of views
 
     Returns:
         tuple: (left_image, right_image)
@@ -313,11 +519,14 @@ def split_at_fold(
     right_start = max(0, fold_x - fold_border)
     right_side = img[:, right_start:]
 
+    if contiguous:
+        return np.ascontiguousarray(left_side), np.ascontiguousarray(right_side)
     return left_side, right_side
 
 
 def crop_to_fold(
-    img: np.ndarray, fold_x: int, fold_side: str, fold_border: int = 50
+    img: np.ndarray, fold_x: int, fold_side: str, fold_border: int = 50,
+    contiguous: bool = False
 ) -> np.ndarray:
     """
     Crop image to one side of fold (for partial books).
@@ -327,6 +536,7 @@ def crop_to_fold(
         fold_x: Fold X coordinate
         fold_side: Which side to keep ('left' or 'right')
         fold_border: Border pixels around fold
+        contiguous: Return a compact copy instead of a view (see split_at_fold)
 
     Returns:
         np.ndarray: Cropped image
@@ -336,8 +546,10 @@ def crop_to_fold(
     if fold_side == "left":
         # Keep left side (fold on right edge)
         end_x = min(w, fold_x + fold_border)
-        return img[:, :end_x]
+        cropped = img[:, :end_x]
     else:  # right
         # Keep right side (fold on left edge)
         start_x = max(0, fold_x - fold_border)
-        return img[:, start_x:]
+        cropped = img[:, start_x:]
+
+    return np.ascontiguousarray(cropped) if contiguous else cropped
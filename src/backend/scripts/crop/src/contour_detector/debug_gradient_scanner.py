@@ -25,9 +25,6 @@ Usage:
 import argparse
 import cv2
 import numpy as np
-import matplotlib
-matplotlib.use("TkAgg")
-import matplotlib.pyplot as plt
 from scipy.signal import find_peaks
 
 # Try scikit-learn for true RANSAC
@@ -136,6 +133,10 @@ def fit_line_ransac(points, min_points=3, residual_threshold=5.0):
 # Plot
 # ---------------------------------------------------------------------------
 def debug_plot_gradient(scanline, gradient, peaks, accepted, rejected, direction, pos, threshold):
+    # matplotlib is only loaded for --debug-matplotlib, not on every import
+    import matplotlib
+    matplotlib.use("TkAgg")
+    import matplotlib.pyplot as plt
     plt.figure(figsize=(9, 4))
     plt.title(f"{direction.upper()} scanline @ {pos}", fontsize=12)
     if gradient.max() > 0 and scanline.max() > 0:
@@ -1,5 +1,4 @@
 import cv2
-import matplotlib.pyplot as plt
 import numpy as np
 from skimage.draw import line as skimage_line
 
@@ -38,7 +37,8 @@ def plot_contour_side_distances(approx_contour):
     # Calcola la distanza media
     mean_distance = np.mean(side_distances)
 
-    # Crea il grafico
+    # Crea il grafico (matplotlib importato solo quando serve un plot)
+    import matplotlib.pyplot as plt
     plt.figure(figsize=(10, 6))
 
     # Subplot 1: Grafico a barre delle distanze
@@ -197,6 +197,7 @@ def contour_side_intensity(approx_contour, gray_image, show_plot=False):
                 f"{rank:>3} | {side_intensities[idx]:9.1f} | {side_angles[idx]:17.1f} gradi | {side_inclinations[idx]:16.1f} gradi | {side_assoc[idx]}"
             )
     if show_plot:
+        import matplotlib.pyplot as plt
         plt.figure(figsize=(12, 6))
         # Subplot 1: Grafico a barre delle intensità ordinate
         plt.subplot(1, 2, 1)
@@ -379,10 +380,20 @@ def find_page_contour(thresh, show_step_by_step=False, original_image=None):
         if show_step_by_step:
             show_image(dilated, "Dilated (fallback)")
 
-        contours, _ = cv2.findContours(dilated, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
-        contours = sorted(contours, key=cv2.contourArea, reverse=True)
-
-        for contour in contours:
+        # Blob areas come straight from connectedComponentsWithStats (the mask
+        # has its holes filled, so pixel area ranks blobs like contourArea);
+        # the contour is traced only for the candidates actually tried,
+        # largest first, inside their bounding box
+        _, labels, stats, _ = cv2.connectedComponentsWithStats(dilated, connectivity=8)
+        order = 1 + np.argsort(stats[1:, cv2.CC_STAT_AREA])[::-1]
+
+        for label in order:
+            x, y, w, h = stats[label, :4]
+            blob = (labels[y:y + h, x:x + w] == label).astype(np.uint8)
+            blob_contours, _ = cv2.findContours(
+                blob, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE, offset=(int(x), int(y))
+            )
+            contour = max(blob_contours, key=cv2.contourArea)
             epsilon = 0.02 * cv2.arcLength(contour, True)
             approx = cv2.approxPolyDP(contour, epsilon, True)
             if len(approx) >= 4:
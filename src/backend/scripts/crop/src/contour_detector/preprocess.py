@@ -251,7 +251,7 @@ def fill_internal_holes(thresh, show_step_by_step=False):
     return combined
 
 
-def preprocess_image(image, show_step_by_step=False):
+def preprocess_image(image, show_step_by_step=False, gray=None):
     """
     Converte l'immagine in scala di grigi, la sfoca, calcola soglia dinamica
     basata sui valori medi dei bordi e binarizza. Restituisce anche il valore RGB medio dei bordi.
@@ -259,13 +259,15 @@ def preprocess_image(image, show_step_by_step=False):
     Args:
         image (np.ndarray): Immagine BGR originale (uint8).
         show_step_by_step (bool): Se True, mostra i passaggi.
+        gray (np.ndarray): Scala di grigi già calcolata (opzionale, evita la conversione).
 
     Returns:
         np.ndarray: Immagine binarizzata (uint8, 0 o 255).
         tuple[float, float, float]: Media (B, G, R) dei bordi in float32.
     """
-    # Converte in scala di grigi
-    gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+    # Converte in scala di grigi (se non fornita dal chiamante)
+    if gray is None:
+        gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
     if show_step_by_step:
         show_image(gray, "Grayscale")
 
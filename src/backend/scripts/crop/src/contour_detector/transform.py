@@ -123,7 +123,7 @@ def irregolar_border(image, box, border_value, step_by_step=False):
     crop_offset_y = max(0, box_rect[1] - 200)
 
     # Create a large crop around the detected box for analysis
-    crop_large = crop_image(image.copy(), box, 200)
+    crop_large = crop_image(image, box, 200)
 
     # Apply strong blur to focus on large regions rather than fine details
     kernel_size = max(21, min(crop_large.shape[:2]) // 20)
@@ -228,6 +228,7 @@ def warp_image(
     scale_factor=1.0,
     image_for_irregolar_border=None,
     contour_for_irregolar_border=None,
+    return_offset=False,
 ):
     """
     Applica una trasformazione affine per raddrizzare una pagina rilevata nell'immagine,
@@ -245,11 +246,13 @@ def warp_image(
         scale_factor (float): Scale factor if image_for_irregolar_border is downscaled (default: 1.0).
         image_for_irregolar_border (np.ndarray): Optional downscaled image for faster irregolar_border computation.
         contour_for_irregolar_border (np.ndarray): Optional downscaled contour matching image_for_irregolar_border.
+        return_offset (bool): Se True, restituisce anche l'offset (x, y) del crop nell'immagine ruotata.
 
     Returns:
         cropped (np.ndarray): Immagine ritagliata e raddrizzata.
         crop_no_rotation (np.ndarray): Ritaglio rettangolare originale senza rotazione.
         M (np.ndarray): Matrice di trasformazione affine (2x3) usata per la rotazione.
+        offset (tuple[int, int]): Offset (x, y) del crop, solo se return_offset=True.
     """
 
     # Ottiene il rettangolo minimo che racchiude il contorno
@@ -277,8 +280,9 @@ def warp_image(
     M = cv2.getRotationMatrix2D(center_box, -angle, 1.0)
 
     # Se l'angolo è zero (o molto vicino), salta la rotazione
+    # (senza rotazione l'immagine viene solo letta: si copia solo il crop finale)
     if abs(angle) < 1e-3:
-        rotated_np = image.copy()
+        rotated_np = image
         M = np.eye(2, 3, dtype=np.float32)
         rotated_box = box.astype(np.float32)
     else:
@@ -302,7 +306,7 @@ def warp_image(
         )
 
         # --- build mask of valid pixels ---
-        mask = np.ones(image.shape[:2], dtype=np.uint8) * 255
+        mask = np.full(image.shape[:2], 255, dtype=np.uint8)
         mask_rotated = cv2.warpAffine(
             mask,
             M,
@@ -323,7 +327,7 @@ def warp_image(
         # Rotation-only mode - return full rotated image without cropping
         if show_step_by_step:
             print("Rotation-only mode: skipping crop, returning full rotated image")
-        cropped = rotated_np
+        cropped = rotated_np.copy() if rotated_np is image else rotated_np
         # Set crop coordinates to 0 for visualization
         x, y, w, h = 0, 0, rotated_np.shape[1], rotated_np.shape[0]
     else:
@@ -346,7 +350,7 @@ def warp_image(
             M_scaled = cv2.getRotationMatrix2D(center_box_scaled, -angle, 1.0)
 
             if abs(angle) < 1e-3:
-                rotated_np_scaled = image_for_irregolar_border.copy()
+                rotated_np_scaled = image_for_irregolar_border
                 rotated_box_scaled = box_scaled.astype(np.float32)
             else:
                 # Calculate new dimensions for downscaled rotated image
@@ -368,7 +372,7 @@ def warp_image(
                 )
 
                 # Build mask for downscaled image
-                mask_scaled = np.ones(image_for_irregolar_border.shape[:2], dtype=np.uint8) * 255
+                mask_scaled = np.full(image_for_irregolar_border.shape[:2], 255, dtype=np.uint8)
                 mask_rotated_scaled = cv2.warpAffine(
                     mask_scaled,
                     M_scaled,
@@ -383,7 +387,7 @@ def warp_image(
 
             # Run irregolar_border on downscaled rotated image
             crop_coords_scaled = irregolar_border(
-                rotated_np_scaled.copy(), rotated_box_scaled, border_value, show_step_by_step
+                rotated_np_scaled, rotated_box_scaled, border_value, show_step_by_step
             )
 
             if crop_coords_scaled is not None:
@@ -419,7 +423,7 @@ def warp_image(
                 print("Using full-size image for irregolar_border computation")
 
             crop_coords = irregolar_border(
-                rotated_np.copy(), rotated_box, border_value, show_step_by_step
+                rotated_np, rotated_box, border_value, show_step_by_step
             )
 
             if crop_coords is not None:
@@ -439,6 +443,8 @@ def warp_image(
                 h += int(border_pixels * 2)
 
         cropped = rotated_np[y : y + h, x : x + w]
+        if rotated_np is image:
+            cropped = cropped.copy()
 
     # Visualizza il risultato se richiesto
     if show_step_by_step:
@@ -454,4 +460,6 @@ def warp_image(
         else:
             show_image(cropped, "Rotated and Cropped")
 
+    if return_offset:
+        return cropped, crop_no_rotation, M, (x, y)
     return cropped, crop_no_rotation, M
@@ -7,14 +7,20 @@ Modulo per funzioni di debug e visualizzazione.
 import cv2
 import os
 import numpy as np
-from scipy.optimize import curve_fit
 from .utils import parabola
 
+# Debug images and plots are only looked at: lower JPEG quality without the
+# optimize/progressive passes, and plots at 72 dpi
+JPEG_DEBUG_PARAMS = [cv2.IMWRITE_JPEG_QUALITY, 60, cv2.IMWRITE_JPEG_OPTIMIZE, 0, cv2.IMWRITE_JPEG_PROGRESSIVE, 0]
+DEBUG_PLOT_DPI = 72
+
 
 def save_debug_visualization(filtered_profiles, mean_profile, std_profile, x_axis, x0, x_min, x_final, roi, debug_dir):
     """
     Salva le immagini di debug per l'analisi visiva.
     """
+    import matplotlib
+    matplotlib.use('Agg')  # Solo file, nessun backend GUI da sondare
     import matplotlib.pyplot as plt
     os.makedirs(debug_dir, exist_ok=True)
 
@@ -32,7 +38,7 @@ def save_debug_visualization(filtered_profiles, mean_profile, std_profile, x_axi
     ax2.set_title('ROI preview')
     ax2.axis('off')
     plt.tight_layout()
-    plt.savefig(os.path.join(debug_dir, 'step_profiles.png'))
+    plt.savefig(os.path.join(debug_dir, 'step_profiles.png'), dpi=DEBUG_PLOT_DPI)
     plt.close(fig)
 
     fig, ax = plt.subplots(figsize=(8, 4))
@@ -42,13 +48,13 @@ def save_debug_visualization(filtered_profiles, mean_profile, std_profile, x_axi
     ax.axvline(x0 + x_min, color='gray', linestyle='--', label='Min raw')
     ax.axvline(x_final, color='red', linestyle='--', label='Min refined')
     x_fit = np.arange(max(0, x_min-15), min(len(smooth), x_min+16))
-    popt, _ = curve_fit(parabola, x_fit, smooth[x_fit])
+    popt = np.polyfit(x_fit, smooth[x_fit], 2)
     ax.plot(x0 + x_fit, parabola(x_fit, *popt), 'r:', label='Parabolic fit')
     ax.set_title('Profile + Fit')
     ax.legend()
     ax.grid(True)
     plt.tight_layout()
-    plt.savefig(os.path.join(debug_dir, 'step_min_fit.png'))
+    plt.savefig(os.path.join(debug_dir, 'step_min_fit.png'), dpi=DEBUG_PLOT_DPI)
     plt.close(fig)
 
 
@@ -102,4 +108,4 @@ def save_debug_line_visualization(img, x_fold, angle, a, b, output_path,
         vis = img.copy()
         cv2.line(vis, fold_p1_rect, fold_p2_rect, (0, 0, 255), 2)
 
-    cv2.imwrite(output_path, vis)
+    cv2.imwrite(output_path, vis, JPEG_DEBUG_PARAMS)
@@ -17,9 +17,8 @@ Version: 3.0 (Simplified)
 
 import cv2
 import numpy as np
-from scipy.optimize import curve_fit
 
-from .utils import parabola
+from .utils import refine_min_vertex
 
 
 def extract_simple_brightness_profiles(roi, rows=None, num_samples=60):
@@ -48,33 +47,28 @@ def extract_simple_brightness_profiles(roi, rows=None, num_samples=60):
         else:
             rows = np.random.choice(h, size=num_samples, replace=False)
 
-    # Extract brightness profiles
-    profiles = [roi[r, :] for r in rows]
-    avg_ints = [prof.mean() for prof in profiles]
+    # Extract brightness profiles (one row of the array per profile)
+    profiles = roi[np.asarray(rows)]
+    avg_ints = profiles.mean(axis=1)
 
     # Simple outlier filtering using 1.5 sigma rule
-    mean_int = np.mean(avg_ints)
-    std_int = np.std(avg_ints)
+    mean_int = avg_ints.mean()
+    std_int = avg_ints.std()
 
-    filtered_profiles = [
-        prof
-        for prof, avg in zip(profiles, avg_ints)
-        if abs(avg - mean_int) <= 1.5 * std_int
-    ]
+    keep = np.abs(avg_ints - mean_int) <= 1.5 * std_int
 
     # Fallback if all profiles filtered out
-    if not filtered_profiles:
-        filtered_profiles = profiles
+    arr = profiles[keep] if keep.any() else profiles
 
-    # Calculate ensemble statistics
-    arr = np.array(filtered_profiles)
-    mean_profile = arr.mean(axis=0)
-    std_profile = arr.std(axis=0)
+    # Calculate ensemble statistics (float32 is ample for 8-bit data and
+    # halves the temporaries std() allocates over the sampled rows)
+    mean_profile = arr.mean(axis=0, dtype=np.float32)
+    std_profile = arr.std(axis=0, dtype=np.float32)
 
     return mean_profile, std_profile
 
 
-def find_fold_center(img=None, roi=None):
+def find_fold_center(img=None, roi=None, gray=None):
     """
     Find Fold Center Position with Quality Assessment
     ================================================
@@ -86,6 +80,7 @@ def find_fold_center(img=None, roi=None):
     Args:
         img (np.ndarray): Full BGR image (will extract center ROI)
         roi (np.ndarray): Custom ROI grayscale image (optional)
+        gray (np.ndarray): Precomputed grayscale of img (optional, skips conversion)
 
     Returns:
         tuple: (x_position, quality_score)
@@ -98,7 +93,8 @@ def find_fold_center(img=None, roi=None):
         x_offset = 0  # No offset needed for custom ROI
     elif img is not None:
         # Extract center ROI from full image
-        gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
+        if gray is None:
+            gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
         h, w = gray.shape
         # Use center 20% of image
         x_start = int(0.4 * w)
@@ -131,6 +127,13 @@ def find_fold_center(img=None, roi=None):
 
     profile_sum = None
 
+    # Per-iteration smoothing kernel: every profile spans the ROI width, so
+    # the size is fixed for the whole loop.
+    # For 1D smoothing, use smaller kernel (1% of profile width)
+    smooth_kernel_size = max(3, int(roi_width * 0.01))  # 1% of profile width, minimum 3
+    if smooth_kernel_size % 2 == 0:  # Ensure odd number
+        smooth_kernel_size += 1
+
     # Track position across all iterations
     for i in range(iterations):
         # Extract brightness profiles for this iteration using different row partitions
@@ -166,35 +169,16 @@ def find_fold_center(img=None, roi=None):
             profiles_sum += enhanced_profile
 
         # Apply smoothing for this iteration with adaptive kernel size
-        # For 1D smoothing, use smaller kernel (1% of profile width)
-        profile_length = len(enhanced_profile)
-        smooth_kernel_size = max(
-            3, int(profile_length * 0.01)
-        )  # 1% of profile width, minimum 3
-        if smooth_kernel_size % 2 == 0:  # Ensure odd number
-            smooth_kernel_size += 1
-
         smooth = cv2.GaussianBlur(
             enhanced_profile, (smooth_kernel_size, 1), 0
         ).flatten()
 
         # Find approximate minimum position for this iteration
-        x_min = np.argmin(smooth)
-
-        # Define fitting window around minimum
-        x_fit = np.arange(max(0, x_min - 15), min(len(smooth), x_min + 16))
-        y_fit = smooth[x_fit]
-
-        # Fit parabolic curve for this iteration
-        try:
-            popt, _ = curve_fit(parabola, x_fit, y_fit)
-            # Calculate exact parabola vertex (minimum) position
-            x_refined = -popt[1] / (2 * popt[0])
-            x_iteration = x_offset + x_refined
-        except Exception as e:
-            # Fallback to simple minimum if curve fitting fails
-            print("Error in curve fitting:", e)
-            x_iteration = x_offset + x_min
+        x_min = int(np.argmin(smooth))
+
+        # Sub-pixel refinement: vertex of the parabola through the minimum
+        # and its two neighbours (falls back to x_min at the profile edges)
+        x_iteration = x_offset + refine_min_vertex(smooth, x_min)
 
         detected_positions.append(x_iteration)
 
@@ -377,7 +361,7 @@ def find_fold_center(img=None, roi=None):
     return x_final, quality_score
 
 
-def detect_fold_brightness_profile(img, side, debug=False, debug_dir=None):
+def detect_fold_brightness_profile(img, side, debug=False, debug_dir=None, gray=None):
     """
     Main Fold Detection Function with Quality Assessment
     ===================================================
@@ -391,6 +375,7 @@ def detect_fold_brightness_profile(img, side, debug=False, debug_dir=None):
         side (str): Fold side (ignored - always uses center)
         debug (bool): Debug flag (ignored in simplified version)
         debug_dir (str): Debug directory (ignored in simplified version)
+        gray (np.ndarray): Precomputed grayscale of img (optional)
 
     Returns:
         tuple: (x_final, angle, slope, intercept, confidence)
@@ -401,7 +386,7 @@ def detect_fold_brightness_profile(img, side, debug=False, debug_dir=None):
                - confidence (float): Quality score based on position consistency (0.0-1.0)
     """
     # Use fold detection with quality assessment
-    x_final, quality_score = find_fold_center(img=img)
+    x_final, quality_score = find_fold_center(img=img, gray=gray)
 
     # Return quality score as confidence for compatibility
     # For vertical line at x=x_final: equation is x = 0*y + x_final
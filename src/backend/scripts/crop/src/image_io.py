@@ -5,12 +5,23 @@ Modulo per il caricamento e salvataggio delle immagini con supporto per diversi
 """
 
 import cv2
+import numpy as np
 import os
 
 
 def load_image(input_path):
-    """Carica un'immagine senza perdita di qualità."""
-    img = cv2.imread(input_path, cv2.IMREAD_UNCHANGED)
+    """
+    Carica un'immagine senza perdita di qualità.
+
+    Il file viene letto in un buffer e decodificato da OpenCV direttamente in
+    BGR (nessun passaggio da PIL né conversione di colore); a differenza di
+    cv2.imread funziona anche con percorsi non ASCII su Windows.
+    """
+    try:
+        buf = np.fromfile(input_path, dtype=np.uint8)
+    except OSError:
+        buf = None
+    img = cv2.imdecode(buf, cv2.IMREAD_UNCHANGED) if buf is not None and buf.size else None
     if img is None:
         raise ValueError(f"Image not found: {input_path}")
     return img
@@ -20,3 +20,18 @@ def resize_width_hd(img, target_width=1920):
 def parabola(x, a, b, c):
     """Funzione parabolica per fit."""
     return a*x**2 + b*x + c
+
+
+def refine_min_vertex(profile, i):
+    """
+    Posizione sub-pixel del minimo in i: vertice della parabola per i tre
+    campioni i-1, i, i+1 (forma chiusa, nessun fit).
+    Ritorna: i stesso ai bordi del profilo o se i tre punti sono allineati.
+    """
+    if i <= 0 or i >= len(profile) - 1:
+        return float(i)
+    ym1, y0, yp1 = float(profile[i - 1]), float(profile[i]), float(profile[i + 1])
+    denom = ym1 - 2 * y0 + yp1
+    if denom <= 0:
+        return float(i)
+    return i + 0.5 * (ym1 - yp1) / denom
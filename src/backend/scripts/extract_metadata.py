@@ -1,7 +1,32 @@
 #!/usr/bin/env python3
 import sys
 import json
-import xml.etree.ElementTree as ET
+from functools import lru_cache
+
+try:
+    from lxml import etree as ET
+    HAVE_LXML = True
+except ImportError:
+    import xml.etree.ElementTree as ET
+    HAVE_LXML = False
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Namespaces
+NAMESPACES = {
+    'md': 'http://www.iccu.sbn.it/metaAG1.pdf',  # default namespace
+    'dc': 'http://purl.org/dc/elements/1.1/',
+    'niso': 'http://www.niso.org/pdfs/DataDict.pdf',
+    'xlink': 'http://www.w3.org/1999/xlink'
+}
+
+@lru_cache(maxsize=None)
+def _qualified_attr(ns_uri, local_name):
+    """Build the ElementTree key of a namespaced attribute ({uri}name)."""
+    return f'{{{ns_uri}}}{local_name}'
 
 def get_value(root, xpath, namespaces):
     """Extract value from XML using XPath."""
@@ -16,8 +41,9 @@ def get_value(root, xpath, namespaces):
             elem = root.find(element_path, namespaces)
             if elem is not None:
                 # Try with namespace
-                for ns_prefix, ns_uri in namespaces.items():
-                    full_attr = f'{{{ns_uri}}}{attr_name.split(":")[-1]}'
+                local_name = attr_name.split(":")[-1]
+                for ns_uri in namespaces.values():
+                    full_attr = _qualified_attr(ns_uri, local_name)
                     if full_attr in elem.attrib:
                         return elem.attrib[full_attr]
                 # Try without namespace
@@ -35,54 +61,78 @@ def get_value(root, xpath, namespaces):
             return elem.text.strip()
     return None
 
+IMG_TAG = _qualified_attr(NAMESPACES['md'], 'img')
+ALTIMG_TAG = _qualified_attr(NAMESPACES['md'], 'altimg')
+FILE_TAG = _qualified_attr(NAMESPACES['md'], 'file')
+HREF_ATTR = _qualified_attr(NAMESPACES['xlink'], 'href')
+
+def _first_child(elem, tag):
+    """Return the first direct child with the given tag, or None."""
+    for child in elem:
+        if child.tag == tag:
+            return child
+    return None
+
+def _image_files(img_elem):
+    """Collect all file hrefs of an image (main file first, then altimg files)."""
+    all_files = []
+
+    # Main file
+    main_file = _first_child(img_elem, FILE_TAG)
+    if main_file is not None:
+        href = main_file.get(HREF_ATTR)
+        if href:
+            all_files.append(href)
+
+    # Altimg files
+    for altimg in img_elem:
+        if altimg.tag != ALTIMG_TAG:
+            continue
+        alt_file = _first_child(altimg, FILE_TAG)
+        if alt_file is not None:
+            href = alt_file.get(HREF_ATTR)
+            if href:
+                all_files.append(href)
+
+    return all_files
+
 def extract_metadata(xml_path, json_path, map_path, quality='all'):
     """Extract metadata from XML to JSON using mapping."""
 
-    # Parse XML
-    tree = ET.parse(xml_path)
-    root = tree.getroot()
-
-    # Namespaces
-    ns = {
-        'md': 'http://www.iccu.sbn.it/metaAG1.pdf',  # default namespace
-        'dc': 'http://purl.org/dc/elements/1.1/',
-        'niso': 'http://www.niso.org/pdfs/DataDict.pdf',
-        'xlink': 'http://www.w3.org/1999/xlink'
-    }
+    ns = NAMESPACES
 
     # Load mapping
     with open(map_path, 'r') as f:
         mapping = json.load(f)
 
-    # Extract document metadata
-    doc_meta = {}
-    for key, xpath in mapping['document'].items():
-        if isinstance(xpath, bool):
-            doc_meta[key] = xpath
-        elif isinstance(xpath, str):
-            val = get_value(root, xpath, ns)
-            doc_meta[key] = val if val else None
+    # Prepare image field xpaths once: (key, xpath) or (key, [(nkey, xpath), ...])
+    # with the 'img/' prefix removed but namespace prefixes kept
+    image_fields = []
+    for key, xpath in mapping['image'].items():
+        if key == 'filename':
+            continue  # Taken from the selected file
+        if isinstance(xpath, dict):
+            image_fields.append((key, [
+                (nkey, nxpath.replace('img/', '')) for nkey, nxpath in xpath.items()
+            ]))
+        else:
+            image_fields.append((key, xpath.replace('img/', '')))
+
+    # Quality needle is loop-invariant; hrefs are compared case-insensitively
+    needle = f'/{quality}/' if quality != 'all' else None
 
-    # Extract images metadata
+    # Stream the XML: each image is handled when its element is complete and
+    # then cleared, so the whole catalog is never held in memory at once.
+    # lxml filters the img elements in C; stdlib yields every element
     images = []
-    for img_elem in root.findall('.//md:img', ns):
-        # Collect all file hrefs (main + altimg)
-        all_files = []
-
-        # Main file
-        main_file = img_elem.find('md:file', ns)
-        if main_file is not None:
-            href = main_file.get('{http://www.w3.org/1999/xlink}href')
-            if href:
-                all_files.append(href)
+    context = ET.iterparse(
+        xml_path, events=('end',), **({'tag': IMG_TAG} if HAVE_LXML else {})
+    )
+    for _, elem in context:
+        if elem.tag != IMG_TAG:
+            continue
 
-        # Altimg files
-        for altimg in img_elem.findall('md:altimg', ns):
-            alt_file = altimg.find('md:file', ns)
-            if alt_file is not None:
-                href = alt_file.get('{http://www.w3.org/1999/xlink}href')
-                if href:
-                    all_files.append(href)
+        all_files = _image_files(elem)
 
         # Filter by quality
         selected_file = None
@@ -90,40 +140,45 @@ def extract_metadata(xml_path, json_path, map_path, quality='all'):
             selected_file = all_files[0] if all_files else None
         else:
             for f in all_files:
-                if f'/{quality}/' in f.lower():
+                if needle in (f if f.islower() else f.lower()):
                     selected_file = f
                     break
 
         # Skip if no matching file found
         if not selected_file:
+            elem.clear()
             continue
 
         img_meta = {}
 
-        # Override filename with selected file (basename only)
-        import os
-        img_meta['filename'] = os.path.basename(selected_file)
-
-        for key, xpath in mapping['image'].items():
-            if key == 'filename':
-                continue  # Already set above
+        # Override filename with selected file (basename only; hrefs are
+        # URI references, always '/'-separated)
+        img_meta['filename'] = selected_file.rsplit('/', 1)[-1]
 
-            if isinstance(xpath, dict):
+        for key, xpath in image_fields:
+            if isinstance(xpath, list):
                 # Nested object
                 nested = {}
-                for nkey, nxpath in xpath.items():
-                    # Remove 'img/' prefix but keep namespace prefixes
-                    clean_xpath = nxpath.replace('img/', '')
-                    val = get_value(img_elem, clean_xpath, ns)
+                for nkey, nxpath in xpath:
+                    val = get_value(elem, nxpath, ns)
                     nested[nkey] = val if val else None
                 img_meta[key] = nested
             else:
-                # Remove 'img/' prefix but keep namespace prefixes
-                clean_xpath = xpath.replace('img/', '')
-                val = get_value(img_elem, clean_xpath, ns)
+                val = get_value(elem, xpath, ns)
                 img_meta[key] = val if val else None
 
         images.append(img_meta)
+        elem.clear()
+
+    # Extract document metadata (the non-image part of the tree is kept)
+    root = context.root
+    doc_meta = {}
+    for key, xpath in mapping['document'].items():
+        if isinstance(xpath, bool):
+            doc_meta[key] = xpath
+        elif isinstance(xpath, str):
+            val = get_value(root, xpath, ns)
+            doc_meta[key] = val if val else None
 
     # Output JSON
     result = {
@@ -131,8 +186,13 @@ def extract_metadata(xml_path, json_path, map_path, quality='all'):
         'images': images
     }
 
-    with open(json_path, 'w') as f:
-        json.dump(result, f, indent=2)
+    # Both writers emit the same UTF-8 output (non-ASCII characters unescaped)
+    if orjson is not None:
+        with open(json_path, 'wb') as f:
+            f.write(orjson.dumps(result, option=orjson.OPT_INDENT_2))
+    else:
+        with open(json_path, 'w', encoding='utf-8') as f:
+            json.dump(result, f, indent=2, ensure_ascii=False)
 
 if __name__ == '__main__':
     if len(sys.argv) < 4:
@@ -13,13 +13,22 @@ Usage:
 """
 
 import argparse
-import csv
+import io
 import json
 import os
 import random
+import shutil
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import ExitStack
 from pathlib import Path
 from datetime import datetime, timedelta
-from PIL import Image, ImageDraw, ImageFont
+from PIL import Image, ImageChops, ImageDraw, ImageFont
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 # =======================
 # CONFIGURATION
@@ -132,8 +141,24 @@ ARCHIVES = [
 # IMAGE GENERATION
 # =======================
 
+# Per-process canvases by size: images of the same size reuse one buffer
+# (each image is encoded before the next one is drawn)
+_canvases = {}
+
+def _canvas(width, height, color):
+    """Return the cached RGB canvas of this size, filled with color."""
+    img = _canvases.get((width, height))
+    if img is None:
+        img = _canvases[(width, height)] = Image.new('RGB', (width, height), color=color)
+    else:
+        img.paste(color, (0, 0, width, height))
+    return img
+
 def generate_random_image(width=800, height=600, image_format="JPEG"):
-    """Generate a random colored image with text overlay."""
+    """Generate a random colored image with text overlay.
+
+    The image is the reused per-size canvas: save it before the next call.
+    """
     # Random background color
     bg_color = (
         random.randint(100, 255),
@@ -141,7 +166,7 @@ def generate_random_image(width=800, height=600, image_format="JPEG"):
         random.randint(100, 255)
     )
 
-    img = Image.new('RGB', (width, height), color=bg_color)
+    img = _canvas(width, height, bg_color)
     draw = ImageDraw.Draw(img)
 
     # Draw random shapes
@@ -172,9 +197,12 @@ def generate_random_image(width=800, height=600, image_format="JPEG"):
     return img
 
 def generate_book_page_image(width=1200, height=1600):
-    """Generate an image that looks like a scanned book page (for testing crop.py)."""
+    """Generate an image that looks like a scanned book page (for testing crop.py).
+
+    The image is the reused per-size canvas: save it before the next call.
+    """
     # White background
-    img = Image.new('RGB', (width, height), color=(245, 245, 240))
+    img = _canvas(width, height, (245, 245, 240))
     draw = ImageDraw.Draw(img)
 
     # Add some text-like lines
@@ -198,20 +226,21 @@ def generate_book_page_image(width=1200, height=1600):
     fold_side = random.choice(['left', 'right'])
     fold_width = random.randint(30, 80)
 
+    # Darkening ramp per column (strongest at the image edge), applied to the
+    # whole strip with one clipped subtraction instead of per-pixel calls
     if fold_side == 'left':
-        for x in range(fold_width):
-            alpha = int(255 * (fold_width - x) / fold_width * 0.3)
-            for y in range(height):
-                pixel = img.getpixel((x, y))
-                new_pixel = tuple(max(0, c - alpha) for c in pixel)
-                img.putpixel((x, y), new_pixel)
+        ramp = [int(255 * (fold_width - x) / fold_width * 0.3) for x in range(fold_width)]
+        box = (0, 0, fold_width, height)
     else:
-        for x in range(width - fold_width, width):
-            alpha = int(255 * (x - (width - fold_width)) / fold_width * 0.3)
-            for y in range(height):
-                pixel = img.getpixel((x, y))
-                new_pixel = tuple(max(0, c - alpha) for c in pixel)
-                img.putpixel((x, y), new_pixel)
+        ramp = [int(255 * x / fold_width * 0.3) for x in range(fold_width)]
+        box = (width - fold_width, 0, width, height)
+
+    # The one-row ramp is widened to RGB before it is stretched to full
+    # height, so the tall strip is built in a single resize
+    shade = Image.new('L', (fold_width, 1))
+    shade.putdata(ramp)
+    shade = shade.convert('RGB').resize((fold_width, height), Image.NEAREST)
+    img.paste(ImageChops.subtract(img.crop(box), shade), box)
 
     return img
 
@@ -331,45 +360,163 @@ def generate_test_data(num_documents, images_per_doc, use_nested_folders):
 # FILE GENERATION
 # =======================
 
-def create_folder_structure(output_dir, folder_structure):
-    """Create folder structure and generate images."""
-    input_dir = Path(output_dir) / "input"
-    input_dir.mkdir(parents=True, exist_ok=True)
+# Per-process encode buffer, reused by every image a worker saves
+_save_buffer = io.BytesIO()
 
-    print(f"Generating images in {input_dir}...")
+# PIL save options per image format (TIFF: LZW is still a compressed TIFF to
+# decode, but much cheaper to encode than deflate)
+_SAVE_OPTS = {
+    "JPEG": {"format": "JPEG", "quality": 90},
+    "PNG": {"format": "PNG"},
+    "TIFF": {"format": "TIFF", "compression": "tiff_lzw"},
+}
 
-    for doc_id, data in folder_structure.items():
-        folder_name = data["document"]["folder"]
+def _create_image(job):
+    """Generate and save one image (runs in a worker process).
 
-        for img_info in data["images"]:
-            # Determine save path
-            if folder_name:
-                img_dir = input_dir / folder_name
-                img_dir.mkdir(exist_ok=True)
-            else:
-                img_dir = input_dir
+    job is a flat (width, height, format, is_book_page, path, seed) tuple.
+    """
+    width, height, image_format, is_book_page, img_path, seed = job
+    # Workers inherit the parent's random state: reseed so images differ
+    random.seed(seed)
 
-            img_path = img_dir / img_info["filename"]
+    # Generate image
+    if is_book_page:
+        img = generate_book_page_image(width, height)
+    else:
+        img = generate_random_image(width, height, image_format)
 
-            # Generate image
-            if img_info["is_book_page"]:
-                img = generate_book_page_image(img_info["width"], img_info["height"])
-            else:
-                img = generate_random_image(img_info["width"], img_info["height"], img_info["format"])
+    # Encode into the reused in-memory buffer, then write the file in one call
+    buf = _save_buffer
+    buf.seek(0)
+    buf.truncate(0)
+
+    # Save with appropriate format
+    img.save(buf, **_SAVE_OPTS[image_format])
+
+    with open(img_path, 'wb') as f, buf.getbuffer() as data:
+        f.write(data)
+
+    return img_path
 
-            # Save with appropriate format
-            if img_info["format"] == "JPEG":
-                img.save(img_path, "JPEG", quality=90)
-            elif img_info["format"] == "PNG":
-                img.save(img_path, "PNG")
-            elif img_info["format"] == "TIFF":
-                img.save(img_path, "TIFF", compression="tiff_deflate")
+def create_folder_structure(output_dir, folder_structure, workers=None, reuse_images=False, verbose=False):
+    """Create folder structure and generate images (in parallel, one process per CPU).
 
-            print(f"  Created: {img_path.relative_to(output_dir)}")
+    With reuse_images, each distinct (width, height, format, book page) image
+    is rendered and encoded once and the file is copied for every repeat.
+    Progress is printed about every 5% of the images; verbose lists every file.
+    """
+    input_dir = output_dir / "input"
+    input_dir.mkdir(parents=True, exist_ok=True)
+
+    print(f"Generating images in {input_dir}...")
+
+    # Create each distinct folder once, before the pool starts; output paths
+    # are plain strings (PIL and shutil take them as-is)
+    base = os.fspath(input_dir)
+    dir_map = {}
+    for data in folder_structure.values():
+        folder_name = data["document"]["folder"]
+        if folder_name and folder_name not in dir_map:
+            dir_map[folder_name] = os.path.join(base, folder_name)
+            os.makedirs(dir_map[folder_name], exist_ok=True)
+
+    # Flat job tuples: the nested document/image dicts are read once here,
+    # and only the fields a worker needs are sent to it
+    jobs = [
+        (ii["width"], ii["height"], ii["format"], ii["is_book_page"],
+         os.path.join(dir_map.get(data["document"]["folder"], base), ii["filename"]),
+         random.getrandbits(32))
+        for data in folder_structure.values()
+        for ii in data["images"]
+    ]
+
+    # Repeats of an already rendered shape/format become plain file copies
+    copies = []
+    if reuse_images:
+        first_by_key = {}
+        unique_jobs = []
+        for job in jobs:
+            key, img_path = job[:4], job[4]
+            if key in first_by_key:
+                copies.append((first_by_key[key], img_path))
+            else:
+                first_by_key[key] = img_path
+                unique_jobs.append(job)
+        jobs = unique_jobs
+
+    total = len(jobs) + len(copies)
+    step = max(1, total // 20)
+    done = 0
+    # Verbose per-file lines are collected and written in one block at the end
+    msgs = []
+
+    # Images are independent: drawing and encoding run in worker processes,
+    # handed out in chunks to keep the per-task IPC small; progress is
+    # printed by the parent only, in generation order. With a single worker
+    # everything runs in this process (no pool to fork/spawn)
+    with ExitStack() as stack:
+        if workers == 1:
+            created = map(_create_image, jobs)
+        else:
+            executor = stack.enter_context(ProcessPoolExecutor(max_workers=workers))
+            created = executor.map(_create_image, jobs, chunksize=8)
+
+        for img_path in created:
+            done += 1
+            if verbose:
+                msgs.append(f"  Created: {os.path.relpath(img_path, output_dir)}\n")
+            elif done % step == 0:
+                print(f"  {done}/{total} images")
+
+    for src_path, img_path in copies:
+        shutil.copyfile(src_path, img_path)
+        done += 1
+        if verbose:
+            msgs.append(f"  Copied:  {os.path.relpath(img_path, output_dir)}\n")
+        elif done % step == 0:
+            print(f"  {done}/{total} images")
+
+    sys.stdout.write("".join(msgs))
+    print(f"  Created {total} images in {input_dir}")
+
+def _csv_escape(value):
+    """Format one CSV field like the csv module's default dialect (minimal quoting)."""
+    s = "" if value is None else str(value)
+    if "," in s or '"' in s or "\n" in s or "\r" in s:
+        return '"' + s.replace('"', '""') + '"'
+    return s
+
+def _csv_join(fields):
+    """Join fields into CSV text (no line terminator)."""
+    return ",".join(map(_csv_escape, fields))
+
+def _document_csv_parts(doc):
+    """Pre-escaped document columns of a metadata row: (before, after) the image columns."""
+    head = _csv_join((
+        doc["title_it"],
+        doc["title_en"],
+        doc["title_de"],
+        doc["author"],
+        doc["active"],
+        doc["category"],
+        doc["date"],
+        doc["material"],
+        doc["period"],
+    ))
+    tail = _csv_join((
+        doc["archive_path"],
+        doc["archive_name"],
+        doc["parent_archive"] if doc["parent_archive"] else "",
+        doc["archive_description_it"],
+        doc["archive_description_en"],
+        doc["archive_description_de"],
+    ))
+    return head, tail
 
 def create_csv_file(output_dir, documents_data, images_data):
     """Create CSV file with metadata."""
-    csv_path = Path(output_dir) / "input" / "metadata.csv"
+    csv_path = output_dir / "input" / "metadata.csv"
 
     print(f"\nGenerating CSV: {csv_path}...")
 
@@ -398,39 +545,25 @@ def create_csv_file(output_dir, documents_data, images_data):
         "Descrizione Archivio[de]"
     ]
 
-    with open(csv_path, 'w', newline='', encoding='utf-8') as f:
-        writer = csv.writer(f)
-        writer.writerow(headers)
-
-        # Group images by document
-        for img in images_data:
-            # Find document
-            doc = next(d for d in documents_data if d["id"] == img["document_id"])
-
-            row = [
-                img["identifier"],
-                doc["title_it"],
-                doc["title_en"],
-                doc["title_de"],
-                doc["author"],
-                doc["active"],
-                doc["category"],
-                doc["date"],
-                doc["material"],
-                doc["period"],
-                img["subject"],
-                img["description_it"],
-                img["description_en"],
-                img["description_de"],
-                img["folder"] if img["folder"] else "",
-                doc["archive_path"],
-                doc["archive_name"],
-                doc["parent_archive"] if doc["parent_archive"] else "",
-                doc["archive_description_it"],
-                doc["archive_description_en"],
-                doc["archive_description_de"],
-            ]
-            writer.writerow(row)
+    # Document columns are escaped once per document, not once per image;
+    # rows are fixed-schema, so they are joined directly (same bytes as
+    # csv.writer, including its \r\n line terminator)
+    doc_parts = {d["id"]: _document_csv_parts(d) for d in documents_data}
+    lines = [_csv_join(headers) + "\r\n"]
+    for img in images_data:
+        head, tail = doc_parts[img["document_id"]]
+        image_cols = _csv_join((
+            img["subject"],
+            img["description_it"],
+            img["description_en"],
+            img["description_de"],
+            img["folder"] if img["folder"] else "",
+        ))
+        lines.append(f"{_csv_escape(img['identifier'])},{head},{image_cols},{tail}\r\n")
+
+    # The generated table is small: the whole CSV goes out in a single write
+    with open(csv_path, 'w', newline='', encoding='utf-8', buffering=1 << 20) as f:
+        f.write("".join(lines))
 
     print(f"  Created CSV with {len(images_data)} rows")
 
@@ -467,16 +600,20 @@ def create_json_mapping(output_dir):
         }
     }
 
-    json_path = Path(output_dir) / "input" / "test_csv_map.json"
+    json_path = output_dir / "input" / "test_csv_map.json"
 
-    with open(json_path, 'w', encoding='utf-8') as f:
-        json.dump(mapping, f, indent=2, ensure_ascii=False)
+    # orjson writes the same 2-space, UTF-8 JSON in one encoded blob
+    if orjson is not None:
+        json_path.write_bytes(orjson.dumps(mapping, option=orjson.OPT_INDENT_2))
+    else:
+        with open(json_path, 'w', encoding='utf-8') as f:
+            json.dump(mapping, f, indent=2, ensure_ascii=False)
 
     print(f"\nGenerated JSON mapping: {json_path}")
 
 def create_readme(output_dir, num_documents, total_images, has_nested):
     """Create README file explaining the test dataset."""
-    readme_path = Path(output_dir) / "README.md"
+    readme_path = output_dir / "README.md"
 
     content = f"""# Test Dataset for Image Processing Leggio
 
@@ -540,8 +677,7 @@ This dataset tests:
 - File identifiers follow IMG_XXXX format matching CSV Codice column
 """
 
-    with open(readme_path, 'w', encoding='utf-8') as f:
-        f.write(content)
+    readme_path.write_bytes(content.encode('utf-8'))
 
     print(f"\nGenerated README: {readme_path}")
 
@@ -591,6 +727,22 @@ def main():
         action="store_true",
         help="Generate large dataset (12 docs, 6 images each)"
     )
+    parser.add_argument(
+        "--workers", "-w",
+        type=int,
+        default=None,
+        help="Parallel image generation processes (default: number of CPUs; 1 = no process pool)"
+    )
+    parser.add_argument(
+        "--reuse-images",
+        action="store_true",
+        help="Render each distinct size/format once and copy it for repeats (faster, less varied)"
+    )
+    parser.add_argument(
+        "--verbose", "-v",
+        action="store_true",
+        help="List every generated image instead of periodic progress"
+    )
 
     args = parser.parse_args()
 
@@ -606,6 +758,8 @@ def main():
         args.images_per_doc = 6
 
     total_images = args.documents * args.images_per_doc
+    # Built once here; the create_* helpers all take this Path
+    output_dir = Path(args.output)
 
     print("=" * 60)
     print("Image Processing Leggio - Test Data Generator")
@@ -627,16 +781,16 @@ def main():
     )
 
     # Create folder structure and images
-    create_folder_structure(args.output, folder_structure)
+    create_folder_structure(output_dir, folder_structure, args.workers, args.reuse_images, args.verbose)
 
     # Create CSV
-    create_csv_file(args.output, documents_data, images_data)
+    create_csv_file(output_dir, documents_data, images_data)
 
     # Create JSON mapping
-    create_json_mapping(args.output)
+    create_json_mapping(output_dir)
 
     # Create README
-    create_readme(args.output, args.documents, total_images, args.nested)
+    create_readme(output_dir, args.documents, total_images, args.nested)
 
     print("\n" + "=" * 60)
     print("✓ Test dataset generated successfully!")